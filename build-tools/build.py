@@ -2,28 +2,46 @@
 Сборка .exe — безопасный вывод (только ASCII в print)
 """
 
+import hashlib
+import importlib.metadata
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+import pickle
+import re
 import subprocess
 import sys
 from pathlib import Path
 import shutil
 import zipfile
-import toml
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:
+    import tomli as tomllib
 
 
 # --- Пути ---
 ROOT_DIR = Path(__file__).parent.parent
 DIST_DIR = ROOT_DIR / "dist"
 FINAL_DIR = DIST_DIR / "final"
+PYI_CACHE_DIR = ROOT_DIR / ".pyinstaller-cache"
 
 CONFIG_FILE = ROOT_DIR / "build.toml"
 VERSION_FILE = ROOT_DIR / "VERSION"
+REQUIREMENTS_FILE = ROOT_DIR / "requirements.txt"
+
+# Пакеты, версия которых попадает в собранный .exe
+BUILD_PACKAGES = ("pyinstaller", "PyQt6")
+
+VERSION_RE = re.compile(r"\d+\.\d+\.\d+")
 
 
 # --- Чтение версии ---
 try:
     with open(VERSION_FILE, "r", encoding="utf-8") as f:
         VERSION = f.read().strip()
-    if not VERSION.replace(".", "").isdigit() or len(VERSION.split(".")) != 3:
+    if not VERSION_RE.fullmatch(VERSION):
         raise ValueError(f"Invalid version format: {VERSION}")
     print(f"[OK] Version: {VERSION}")
 except Exception as e:
@@ -32,13 +50,45 @@ except Exception as e:
 
 
 # --- Загрузка конфига ---
+def load_config_cached(config_file: Path) -> dict:
+    """
+    Загружает build.toml, используя кэш разобранного конфига.
+
+    Кэш хранится рядом с конфигом (build.toml.cache) вместе с SHA-256
+    исходного файла и пересоздаётся при любом изменении build.toml.
+    """
+    data = config_file.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    cache_file = config_file.with_suffix(".toml.cache")
+
+    try:
+        with open(cache_file, "rb") as f:
+            cached = pickle.load(f)
+        if cached.get("hash") == digest:
+            return cached["payload"]
+    except Exception:
+        pass  # Кэша нет или он повреждён — разбираем заново
+
+    payload = tomllib.loads(data.decode("utf-8"))
+
+    # Атомарная запись: сначала во временный файл, затем замена
+    tmp_file = cache_file.with_name(cache_file.name + ".tmp")
+    try:
+        with open(tmp_file, "wb") as f:
+            pickle.dump({"hash": digest, "payload": payload}, f)
+        os.replace(tmp_file, cache_file)
+    except Exception:
+        tmp_file.unlink(missing_ok=True)  # Кэш необязателен
+
+    return payload
+
+
 try:
     if not CONFIG_FILE.exists():
         print(f"[ERROR] Config file not found: {CONFIG_FILE}")
         sys.exit(1)
 
-    with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-        config = toml.load(f)
+    config = load_config_cached(CONFIG_FILE)
     print("[OK] Config loaded")
 except Exception as e:
     print(f"[ERROR] Failed to load build.toml: {type(e).__name__}")
@@ -52,32 +102,122 @@ build = config["build"]
 # 🔸 Используем короткое ASCII-имя для логов
 BUILD_NAME_LOG = "ConverterCSVtoRDF"  # Только ASCII
 ZIP_NAME = DIST_DIR / f"{BUILD_NAME_LOG}_v{VERSION}.zip"
+COPY_BUFFER_SIZE = 1 << 20  # 1 MiB
 
 
 # --- Очистка ---
+def _remove_folder(folder: Path):
+    """
+    Удаляет папку целиком.
+
+    Returns:
+        None, если папки не было; иначе список ошибок удаления (пустой — успех)
+    """
+    errors = []
+    missing = False
+
+    def on_error(func, path, error):
+        nonlocal missing
+        # onerror передаёт exc_info, onexc (Python 3.12+) — само исключение
+        exc = error[1] if isinstance(error, tuple) else error
+        # Отсутствие самой папки — не ошибка: удалять нечего. Проверки
+        # exists() заранее нет, чтобы не было гонки между ней и удалением
+        if isinstance(exc, FileNotFoundError) and os.fspath(path) == os.fspath(folder):
+            missing = True
+        else:
+            errors.append(exc)
+
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(folder, onexc=on_error)
+    else:
+        shutil.rmtree(folder, onerror=on_error)
+    return None if missing else errors
+
+
 def clean():
-    for folder in ["build", "dist"]:
-        p = Path(folder)
-        if p.exists():
-            shutil.rmtree(p)
+    folders = ["build", "dist"]
+
+    # Удаление папок независимо — выполняем параллельно
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(_remove_folder, [Path(folder) for folder in folders]))
+    for folder, errors in zip(folders, results):
+        if errors is None:
+            continue  # Папки не было — удалять нечего
+        if errors:
+            # Имена файлов могут быть кириллическими — выводим только тип ошибки
+            kinds = ", ".join(sorted({type(e).__name__ for e in errors}))
+            print(f"[WARN] Not fully cleaned: {folder} ({len(errors)} error(s): {kinds})")
+        else:
             print(f"[OK] Cleaned: {folder}")
 
 
 # --- Сборка ---
+def _build_inputs_hash() -> str:
+    """
+    SHA-256 всех входных данных сборки: версий Python, PyInstaller и PyQt6,
+    requirements.txt, настроек PyInstaller, исходников и data-файлов.
+    """
+    h = hashlib.sha256()
+    h.update(sys.version.encode("utf-8"))
+    # Обновление зависимостей должно пересобирать .exe, а не брать его из кэша
+    for package in BUILD_PACKAGES:
+        try:
+            version = importlib.metadata.version(package)
+        except importlib.metadata.PackageNotFoundError:
+            version = "missing"
+        h.update(f"{package}=={version}".encode("utf-8"))
+    if REQUIREMENTS_FILE.exists():
+        h.update(REQUIREMENTS_FILE.read_bytes())
+    h.update(json.dumps(pyi, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+
+    files = [ROOT_DIR / pyi["script"], ROOT_DIR / "config.json"]
+    files.extend(ROOT_DIR / data["src"] for data in pyi.get("datas", []))
+    for path in pyi.get("paths", []):
+        files.extend(sorted((ROOT_DIR / path).rglob("*.py")))
+
+    for file in files:
+        h.update(file.relative_to(ROOT_DIR).as_posix().encode("utf-8"))
+        h.update(file.read_bytes())
+    return h.hexdigest()
+
+
 def build_exe():
+    # data-файлы разрешаются в абсолютные пути заранее: отсутствующий файл
+    # обнаруживается до запуска PyInstaller, а не в середине анализа
+    sep = ";" if sys.platform.startswith("win") else ":"
+    add_data = []
+    for data in pyi.get("datas", []):
+        try:
+            src = (ROOT_DIR / data["src"]).resolve(strict=True)
+        except FileNotFoundError:
+            print(f"[ERROR] Data file not found: {data['src']}")
+            sys.exit(1)
+        add_data.append(f"{src}{sep}{data['dest']}")
+
+    exe_name = f"{pyi['name']}.exe"
+    cached_exe = PYI_CACHE_DIR / exe_name
+    hash_file = PYI_CACHE_DIR / "inputs.sha256"
+    inputs_hash = _build_inputs_hash()
+
+    # Входные данные не менялись — берём .exe из предыдущей сборки
+    if cached_exe.exists() and hash_file.exists() and hash_file.read_text() == inputs_hash:
+        DIST_DIR.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(cached_exe, DIST_DIR / exe_name)
+        print("[OK] Inputs unchanged, cached build reused")
+        return
+
     cmd = [sys.executable, "-m", "PyInstaller"]
     cmd.append("--noconsole")
     cmd.append("--onefile")
+    # Постоянная workpath: clean() её не трогает, анализ PyInstaller переиспользуется
+    cmd.extend(["--workpath", str(PYI_CACHE_DIR / "work")])
 
     if pyi.get("name"):
         # ← Это может быть кириллица, но PyInstaller принимает
         cmd.extend(["--name", pyi["name"]])
 
-    for data in pyi.get("datas", []):
-        src = data["src"]
-        dest = data["dest"]
-        sep = ";" if sys.platform.startswith("win") else ":"
-        cmd.extend(["--add-data", f"{src}{sep}{dest}"])
+    for item in add_data:
+        cmd.extend(["--add-data", item])
 
     for module in pyi.get("hiddenimports", []):
         cmd.extend(["--hidden-import", module])
@@ -93,6 +233,10 @@ def build_exe():
         print("[ERROR] Build failed")
         sys.exit(1)
 
+    PYI_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(DIST_DIR / exe_name, cached_exe)
+    hash_file.write_text(inputs_hash)
+
 
 # --- Подготовка финальной папки ---
 def prepare_final():
@@ -105,22 +249,39 @@ def prepare_final():
         print(f"[ERROR] Executable not found: {exe_name}")
         sys.exit(1)
 
-    shutil.copy(src_exe, dst_exe)
-    print(f"[OK] Binary copied")
-
     config_json = ROOT_DIR / "config.json"
     if not config_json.exists():
         print("[ERROR] config.json not found")
         sys.exit(1)
-    shutil.copy(config_json, FINAL_DIR / "config.json")
+
+    # copyfile — без лишнего copymode; оба копирования идут параллельно
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        exe_future = pool.submit(shutil.copyfile, src_exe, dst_exe)
+        config_future = pool.submit(shutil.copyfile, config_json, FINAL_DIR / "config.json")
+    exe_future.result()
+    print(f"[OK] Binary copied")
+    config_future.result()
     print("[OK] Config copied")
 
 
 # --- Архивация ---
+def _write_stored(zf: zipfile.ZipFile, file: Path) -> None:
+    """Записывает файл в архив без сжатия блоками по 1 MiB (zf.write читает по 8 KiB)."""
+    zinfo = zipfile.ZipInfo.from_file(file, arcname=file.name)
+    zinfo.compress_type = zipfile.ZIP_STORED
+    with open(file, "rb") as src, zf.open(zinfo, "w") as dst:
+        shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+
+
 def make_zip():
-    with zipfile.ZipFile(ZIP_NAME, 'w', zipfile.ZIP_DEFLATED) as zf:
+    # Уровень 1: архив распаковывается редко, скорость важнее степени сжатия
+    with zipfile.ZipFile(ZIP_NAME, 'w', compresslevel=1) as zf:
         for file in FINAL_DIR.iterdir():
-            zf.write(file, arcname=file.name)
+            # .exe от PyInstaller уже сжат — повторное сжатие ничего не даёт
+            if file.suffix == ".exe":
+                _write_stored(zf, file)
+            else:
+                zf.write(file, arcname=file.name, compress_type=zipfile.ZIP_DEFLATED)
     print(f"[OK] Archive created: {ZIP_NAME}")
 
 
@@ -4,14 +4,27 @@
 Автоматически определяет корень проекта
 """
 
+import re
 import subprocess
 import sys
 from pathlib import Path
 
 
-def run(cmd: str, check=True, shell=True):
-    """Выполняет команду с безопасным чтением вывода"""
+def run(cmd: str, check=True, shell=True, capture=False):
+    """
+    Выполняет команду.
+
+    По умолчанию вывод идёт напрямую в терминал, без буферизации и декодирования.
+    С capture=True вывод перехватывается и печатается с безопасным декодированием.
+    """
     print(f"🔧 Выполняю: {cmd}")
+    if not capture:
+        result = subprocess.run(cmd, shell=shell, cwd=ROOT_DIR)  # Все команды — из корня
+        if check and result.returncode != 0:
+            print(f"❌ Ошибка выполнения команды: {result.returncode}")
+            sys.exit(result.returncode)
+        return result
+
     result = subprocess.run(
         cmd,
         shell=shell,
@@ -39,6 +52,7 @@ def run(cmd: str, check=True, shell=True):
 SCRIPT_DIR = Path(__file__).parent
 ROOT_DIR = SCRIPT_DIR.parent  # Корень проекта
 VERSION_FILE = ROOT_DIR / "VERSION"
+VERSION_RE = re.compile(r"\d+\.\d+\.\d+")
 
 # === Основная логика ===
 def main():
@@ -48,7 +62,7 @@ def main():
     version = input("\nВведите номер версии: ").strip()
 
     # Проверка формата
-    if not version.replace(".", "").isdigit() or len(version.split(".")) != 3:
+    if not VERSION_RE.fullmatch(version):
         print("❌ Ошибка: версия должна быть в формате X.Y.Z (например, 1.5.0)")
         sys.exit(1)
 
@@ -72,18 +86,21 @@ def main():
         sys.exit(1)
 
     # Git команды (все — из корня проекта)
-    run("git add VERSION")
-    run(f'git commit -m "chore: bump version to {version}"')
-    run("git checkout main")
-    
+    # Локальные шаги — одним вызовом оболочки (&& работает и в cmd, и в sh)
+    run(" && ".join([
+        "git add VERSION",
+        f'git commit -m "chore: bump version to {version}"',
+        "git checkout main",
+    ]))
+
     # Merge (не критичен)
-    merge_result = run("git merge HEAD@{1} --no-ff -m 'chore: merge release branch'", check=False)
+    merge_result = run("git merge HEAD@{1} --no-ff -m 'chore: merge release branch'", check=False, capture=True)
     if merge_result.returncode != 0:
         print("ℹ️  Merge не требуется или уже выполнен")
 
-    run("git push origin main")
     run(f"git tag {tag_name}")
-    run(f"git push origin {tag_name}")
+    # Ветка и тег отправляются одним push — одно соединение с remote
+    run(f"git push origin main {tag_name}")
 
     print("\n" + "✅" * 50)
     print(f"🎉 Выпуск {tag_name} запущен!")
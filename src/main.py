@@ -11,8 +11,13 @@
 """
 
 import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from multiprocessing import freeze_support
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional, Union
 
 # Импорты из фреймворка
 try:
@@ -36,11 +41,29 @@ from modules.xml_generator import XMLGenerator
 
 
 
+def build_logger_config(config_data: Dict[str, Any]) -> LoggerConfig:
+    """
+    Собирает настройки логирования из конфигурации.
+
+    Args:
+        config_data (dict): Конфигурация приложения (ConfigManager.config)
+
+    Returns:
+        LoggerConfig: Уровень, формат сообщений и формат даты
+    """
+    logging_config = config_data.get("logging") or {}
+    log_level = getattr(logging, logging_config.get("level", "INFO"))
+    log_format = logging_config.get("format", "%(asctime)s [%(levelname)s]: %(message)s")
+    date_format = logging_config.get("date_format", "%Y-%m-%d %H:%M:%S")
+    return LoggerConfig(level=log_level, format_string=log_format, date_format=date_format)
+
+
 def process_file(
     csv_path: Path,
     parent_uid: str,
-    config: ConfigManager,
-    logger: Optional[logging.Logger] = None
+    config: Union[ConfigManager, Dict[str, Any]],
+    logger: Optional[logging.Logger] = None,
+    log_config: Optional[LoggerConfig] = None
 ) -> None:
     """
     Обрабатывает один CSV-файл: парсинг → генерация RDF/XML → сохранение.
@@ -51,69 +74,74 @@ def process_file(
     Args:
         csv_path (Path): Путь к входному CSV-файлу
         parent_uid (str): UID корневого объекта для новой иерархии
-        config (ConfigManager): Конфигурация приложения
+        config (ConfigManager | dict): Конфигурация приложения — менеджер
+            или уже полученный из него словарь (так её получают дочерние процессы)
         logger (Optional[logging.Logger]): Логгер для вывода сообщений.
             Если None — будет создан новый с уровнем из config.
+        log_config (Optional[LoggerConfig]): Готовые настройки для нового логгера.
+            Позволяет не разбирать config заново для каждого файла.
 
     Raises:
         Exception: При ошибках парсинга, генерации или записи файла
     """
+    # config.config возвращает копию — берём её один раз на файл
+    config_data = config.config if isinstance(config, ConfigManager) else config
+
     # Если логгер не передан — создаём свой
     if logger is None:
-        from monitel_framework.logging import LoggerManager, LoggerConfig
-        log_level = getattr(logging, config.get("logging.level", "INFO"))
-        log_format = config.get("logging.format", "%(asctime)s [%(levelname)s]: %(message)s")
-        date_format = config.get("logging.date_format", "%Y-%m-%d %H:%M:%S")
-        log_config = LoggerConfig(level=log_level, format_string=log_format, date_format=date_format)
-        logger_manager = LoggerManager(log_config)
+        logger_manager = LoggerManager(log_config or build_logger_config(config_data))
         logger = logger_manager.create_logger("main")
 
     # Убеждаемся, что logger не None (для Pylance)
     assert logger is not None, "Логгер не должен быть None после инициализации"
 
     try:
-        logger.info(f"Начало обработки файла: {csv_path.name}")
+        logger.info("Начало обработки файла: %s", csv_path.name)
 
         # Парсинг CSV
-        parser = HierarchyParser(str(csv_path), config.config, logger=logger)
+        parser = HierarchyParser(str(csv_path), config_data, logger=logger)
         paths, external_children, cck_map, parent_uid_map = parser.parse()
-        logger.info(f"Загружено путей: {len(paths)}")
+        logger.info("Загружено путей: %s", len(paths))
 
         if not paths:
             logger.error("❌ Нет данных для обработки — файл пуст или не содержит валидных путей")
             return
 
-        # Генерация XML
-        generator = XMLGenerator(config.config, logger=logger)
-        xml_content = generator.generate(
-            paths=paths,
-            external_children=external_children,
-            parent_uid=parent_uid,
-            cck_map=cck_map,
-            parent_uid_map=parent_uid_map,
-            virtual_containers=set(getattr(parser, 'path_to_uid', {}).keys())
-        )
-        logger.info("✅ Генерация XML завершена")
-
-        # Сохранение
+        # Генерация XML с потоковой записью в файл (буфер 1 МБ)
+        generator = XMLGenerator(config_data, logger=logger)
         output_path = csv_path.with_suffix(".xml")
-        if output_path.exists():
-            output_path.unlink()
-            logger.debug(f"Удалён существующий файл: {output_path}")
-
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(xml_content)
+        # Пишем во временный файл и атомарно подменяем им результат:
+        # прежний XML остаётся целым, пока новый не записан полностью
+        tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+
+        try:
+            with open(tmp_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+                generator.generate_to(
+                    f,
+                    paths=paths,
+                    external_children=external_children,
+                    parent_uid=parent_uid,
+                    cck_map=cck_map,
+                    parent_uid_map=parent_uid_map,
+                    virtual_containers=set(getattr(parser, 'path_to_uid', {}).keys())
+                )
+            os.replace(tmp_path, output_path)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        logger.info("✅ Генерация XML завершена")
 
-        logger.info(f"✅ Файл успешно сохранён: {output_path}")
+        logger.info("✅ Файл успешно сохранён: %s", output_path)
 
     except Exception as e:
-        logger.error(f"❌ Ошибка при обработке {csv_path.name}: {e}", exc_info=True)
+        logger.error("❌ Ошибка при обработке %s: %s", csv_path.name, e, exc_info=True)
         raise
 
 def main():
     """Основная функция CLI-интерфейса."""
     cli_manager = CLIManager()
     folder_uid, csv_dir = cli_manager.get_cli_parameters()
+    jobs = cli_manager.get_jobs()
 
     if not folder_uid:
         print("❌ Не указан UID папки.")
@@ -140,21 +168,52 @@ def main():
         print("❌ Нет подходящих CSV-файлов.")
         return
 
-    print("Будут обработаны:")
-    for f in csv_files:
-        print(f"  {f}")
-    print("-" * 30)
+    # Весь список — одной записью в stdout, а не print на каждый файл
+    sys.stdout.write(
+        "Будут обработаны:\n"
+        + "".join(f"  {f}\n" for f in csv_files)
+        + "-" * 30 + "\n"
+    )
 
     # --- Создание директории логов ---
     file_manager.create_log_directory()
 
-    # --- Обработка каждого файла ---
-    for filename in csv_files:
-        csv_path = file_manager.base_directory / filename
-        process_file(csv_path, folder_uid, config)
+    # --- Обработка файлов ---
+    # Файлы независимы (свой парсер, генератор и выходной XML), поэтому
+    # обрабатываются в отдельных процессах. Логгер каждый процесс создаёт сам.
+    # В процессы передаются только данные: словарь конфига и LoggerConfig,
+    # а не ConfigManager с его блокировками и таймером сохранения
+    csv_paths = [file_manager.base_directory / filename for filename in csv_files]
+    config_data = config.config
+    # Настройки логирования разбираются один раз, а не в каждом process_file
+    worker = partial(
+        process_file,
+        parent_uid=folder_uid,
+        config=config_data,
+        log_config=build_logger_config(config_data)
+    )
+    max_workers = min(len(csv_paths), jobs or os.cpu_count() or 1)
+    if max_workers == 1:
+        # Один процесс — запуск пула только добавит задержку
+        for csv_path in csv_paths:
+            worker(csv_path)
+            print(f"✅ Обработан: {csv_path.name}")
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(worker, csv_path): csv_path for csv_path in csv_paths}
+            try:
+                # Сообщаем о файлах по мере готовности, а не в порядке запуска
+                for future in as_completed(futures):
+                    future.result()
+                    print(f"✅ Обработан: {futures[future].name}")
+            except BaseException:
+                # Ошибка в одном файле: ещё не начатые файлы не обрабатываем
+                executor.shutdown(cancel_futures=True)
+                raise
 
     cli_manager.print_completion_message()
 
 
 if __name__ == "__main__":
+    freeze_support()  # Нужен дочерним процессам в собранном .exe
     main()
\ No newline at end of file
@@ -5,11 +5,22 @@
 Логирование делегируется внешнему логгеру для согласованности с системой.
 """
 
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Set, Any, DefaultDict
 from pathlib import Path
+import codecs
 import csv
+import io
 import logging
+import mmap
+import os
 from collections import defaultdict
+from itertools import groupby
+
+
+def _normalize_path(path: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Удаляет повторяющиеся последовательные элементы пути."""
+    # groupby схлопывает подряд идущие одинаковые элементы на уровне C
+    return tuple(key for key, _ in groupby(path))
 
 
 class HierarchyParser:
@@ -38,8 +49,8 @@ class HierarchyParser:
         self.file_path = Path(file_path) if file_path else None
         self.config = config or {}
         self.logger = logger or logging.getLogger(__name__)
-        self.paths_with_uid = set()
-        self.path_to_uid = {}  # путь → uid (виртуальные контейнеры)
+        self.paths_with_uid: Set[Tuple[str, ...]] = set()
+        self.path_to_uid: Dict[Tuple[str, ...], str] = {}  # путь → uid (виртуальные контейнеры)
 
     def _normalize_path(self, path: Tuple[str, ...]) -> Tuple[str, ...]:
         """
@@ -53,26 +64,96 @@ class HierarchyParser:
         Returns:
             tuple: Нормализованный путь.
         """
-        if not path:
-            return path
-        normalized = [path[0]]
-        for i in range(1, len(path)):
-            if path[i] != normalized[-1]:
-                normalized.append(path[i])
-        return tuple(normalized)
-
-    def _read_lines(self) -> List[Tuple[str, str, str]]:
+        return _normalize_path(path)
+
+    def _detect_encoding(self, sample_size: int = 4096) -> str:
+        """
+        Определяет кодировку файла по BOM и первым байтам.
+
+        Args:
+            sample_size (int): Сколько байт читать для анализа.
+
+        Returns:
+            str: 'utf-8-sig' или 'utf-16' при наличии соответствующего BOM,
+                'utf-8' если начало файла корректно декодируется как UTF-8,
+                иначе 'cp1251'.
+        """
+        assert self.file_path is not None, "Путь к файлу не задан"
+        with open(self.file_path, 'rb') as f:
+            raw = f.read(sample_size)
+
+        if raw.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+        if raw.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            return 'utf-16'  # Например, «Юникод-текст» из Excel
+        try:
+            # final=False: последний символ мог быть обрезан границей буфера
+            codecs.getincrementaldecoder('utf-8')().decode(raw, final=False)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            return 'cp1251'
+
+    def _read_text(self, encoding: str) -> str:
+        """
+        Читает и декодирует файл целиком через отображение в память.
+
+        Байты декодируются прямо из mmap, без промежуточных буферов чтения
+        и копий, как при построчном чтении текстового файла.
+
+        Args:
+            encoding (str): Кодировка файла.
+
+        Returns:
+            str: Содержимое файла.
+
+        Raises:
+            UnicodeDecodeError: Если файл не декодируется в указанной кодировке.
+        """
+        assert self.file_path is not None, "Путь к файлу не задан"
+        with open(self.file_path, 'rb') as f:
+            # Пустой файл отобразить нельзя
+            if os.fstat(f.fileno()).st_size == 0:
+                return ''
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return str(mm, encoding)
+
+    def _split_path(
+        self,
+        path: str,
+        segments: Optional[Dict[str, str]] = None
+    ) -> Tuple[str, ...]:
+        """
+        Разбивает строку пути по '\\' и нормализует результат.
+
+        Args:
+            path (str): Путь вида 'A\\B\\C'.
+            segments (dict, optional): Таблица уже встречавшихся сегментов.
+                Одинаковые сегменты разных строк заменяются одним объектом str.
+
+        Returns:
+            tuple: Нормализованный путь (может быть пустым).
+        """
+        stripped = (p.strip() for p in path.split('\\'))
+        if segments is None:
+            parts = tuple(s for s in stripped if s)
+        else:
+            parts = tuple(segments.setdefault(s, s) for s in stripped if s)
+        return self._normalize_path(parts)
+
+    def _read_lines(self) -> List[Tuple[Tuple[str, ...], str, str]]:
         """
         Читает строки из CSV-файла или возвращает тестовые данные.
 
+        Путь каждой строки разбирается и нормализуется здесь же, один раз.
+
         Returns:
-            list: Список кортежей (путь, uid, cck_code).
+            list: Список кортежей (нормализованный путь, uid, cck_code).
 
         Raises:
             Exception: Если не удалось прочитать файл ни в одной кодировке.
         """
         if self.file_path and self.file_path.exists():
-            self.logger.info(f"Чтение данных из файла: {self.file_path}")
+            self.logger.info("Чтение данных из файла: %s", self.file_path)
 
             # Получаем имена колонок из конфига
             csv_headers = self.config.get("csv", {}).get("headers", {})
@@ -81,40 +162,63 @@ class HierarchyParser:
             cck_header = csv_headers.get("cck_code", "ОбъектРемонтаКодККС")
 
             encodings = ['utf-8-sig', 'utf-8', 'cp1251', 'windows-1251']
-            data = []
+            # Сначала пробуем определённую по началу файла кодировку,
+            # остальные — только если файл не декодировался целиком
+            detected = self._detect_encoding()
+            self.logger.debug("Определена кодировка: %s", detected)
+            encodings = [detected] + [e for e in encodings if e != detected]
             last_error = None
 
             for encoding in encodings:
+                data = []
+                # Сегменты вроде «Корпус 1» повторяются в тысячах строк —
+                # храним по одному экземпляру каждого
+                segments: Dict[str, str] = {}
                 try:
-                    with open(self.file_path, 'r', encoding=encoding) as f:
-                        sample = f.read(1024)
-                        f.seek(0)
-                        delimiter = ';' if ';' in sample else '\t' if '\t' in sample else ','
-
-                        reader = csv.DictReader(f, delimiter=delimiter)
-
-                        if path_header not in reader.fieldnames:
-                            raise ValueError(f"В CSV отсутствует поле пути: '{path_header}'")
-
-                        for i, row in enumerate(reader):
-                            path = row.get(path_header, '').strip()
-                            uid = row.get(uid_header, '').strip()
-                            cck_code = row.get(cck_header, '').strip() if cck_header else ""
-
-                            if path:
-                                parts = tuple(p.strip() for p in path.split('\\') if p.strip())
-                                normalized_parts = self._normalize_path(parts)
-                                data.append((path, uid, cck_code))
-
-                    self.logger.debug(f"Прочитано {len(data)} строк из файла")
+                    text = self._read_text(encoding)
+                    sample = text[:1024]
+                    delimiter = ';' if ';' in sample else '\t' if '\t' in sample else ','
+
+                    # newline=None — универсальные переводы строк, как при open() в текстовом режиме
+                    reader = csv.reader(io.StringIO(text, newline=None), delimiter=delimiter)
+                    headers = next(reader, [])
+
+                    if path_header not in headers:
+                        raise ValueError(f"В CSV отсутствует поле пути: '{path_header}'")
+
+                    # Индексы колонок вычисляются один раз; -1 — колонки нет
+                    path_idx = headers.index(path_header)
+                    uid_idx = headers.index(uid_header) if uid_header in headers else -1
+                    cck_idx = headers.index(cck_header) if cck_header and cck_header in headers else -1
+
+                    for row in reader:
+                        if len(row) <= path_idx:
+                            continue
+                        path = row[path_idx]
+                        if not path:
+                            continue
+                        # uid и ККС чаще всего пусты — strip() только для непустых
+                        uid = row[uid_idx] if 0 <= uid_idx < len(row) else ""
+                        if uid:
+                            uid = uid.strip()
+                        cck_code = row[cck_idx] if 0 <= cck_idx < len(row) else ""
+                        if cck_code:
+                            cck_code = cck_code.strip()
+
+                        # Пробельные сегменты отбрасывает _split_path
+                        normalized_parts = self._split_path(path, segments)
+                        if normalized_parts:
+                            data.append((normalized_parts, uid, cck_code))
+
+                    self.logger.debug("Прочитано %s строк из файла", len(data))
                     return data
 
                 except UnicodeDecodeError as e:
                     last_error = e
-                    self.logger.debug(f"Не удалось прочитать в кодировке {encoding}: {e}")
+                    self.logger.debug("Не удалось прочитать в кодировке %s: %s", encoding, e)
                     continue
                 except Exception as e:
-                    self.logger.error(f"Ошибка чтения файла: {e}", exc_info=True)
+                    self.logger.error("Ошибка чтения файла: %s", e, exc_info=True)
                     raise
 
             if last_error:
@@ -127,10 +231,13 @@ class HierarchyParser:
         else:
             self.logger.warning("Файл не найден. Используются тестовые данные.")
             return [
-                ("A\\", "", ""),
-                ("A\\B", "123-456", ""),
-                ("A\\B\\C", "", ""),
-                ("A\\B\\C\\D", "", ""),
+                (self._split_path(path), uid, cck_code)
+                for path, uid, cck_code in [
+                    ("A\\", "", ""),
+                    ("A\\B", "123-456", ""),
+                    ("A\\B\\C", "", ""),
+                    ("A\\B\\C\\D", "", ""),
+                ]
             ]
 
     def parse(self) -> Tuple[
@@ -147,60 +254,76 @@ class HierarchyParser:
         """
         lines = self._read_lines()
 
-        path_to_uid = {}
-        path_to_cck = {}
-        all_paths = []
+        path_to_uid: Dict[Tuple[str, ...], str] = {}
+        path_to_cck: Dict[Tuple[str, ...], str] = {}
+        all_paths: List[Tuple[str, ...]] = []
 
-        for line, uid, cck_code in lines:
-            parts = tuple(p.strip() for p in line.split('\\') if p.strip())
-            normalized_parts = self._normalize_path(parts)
-            if normalized_parts:
-                all_paths.append(normalized_parts)
-                if uid:
-                    path_to_uid[normalized_parts] = uid
-                if cck_code:
-                    path_to_cck[normalized_parts] = cck_code
+        for normalized_parts, uid, cck_code in lines:
+            all_paths.append(normalized_parts)
+            if uid:
+                path_to_uid[normalized_parts] = uid
+            if cck_code:
+                path_to_cck[normalized_parts] = cck_code
 
         self.path_to_uid = path_to_uid
-        self.logger.debug(f"Найдено виртуальных контейнеров: {len(path_to_uid)}")
-
-        paths_to_create = set()
-        external_children = defaultdict(list)
-        parent_uid_map = {}
-
-        # 1. Добавляем все пути
+        self.logger.debug("Найдено виртуальных контейнеров: %s", len(path_to_uid))
+        # Неизменяемое множество виртуальных путей для проверок принадлежности
+        virtual_set = frozenset(path_to_uid)
+
+        # Обычный dict с setdefault: результат возвращается как есть,
+        # без копирования defaultdict в dict в конце
+        external_children: Dict[Tuple[str, ...], List[str]] = {}
+        parent_uid_map: Dict[Tuple[str, ...], str] = {}
+
+        # 1-2. Все пути вместе с предками (полная иерархия) одним проходом.
+        # Префиксы перебираются от длинного к короткому до первого уже
+        # известного: known замкнут по префиксам, поэтому все предки
+        # найденного тоже известны. Общие для строк предки («Корпус 1» и т.п.)
+        # не пересоздаются на каждой строке.
+        # Пути уже нормализованы в _read_lines, а префикс нормализованного
+        # пути нормализован сам по себе — повторная нормализация не нужна.
+        known: Dict[Tuple[str, ...], None] = {}
         for path in all_paths:
-            paths_to_create.add(path)
-
-        # 2. Добавляем предков для полной иерархии
-        for path in list(paths_to_create):
-            for i in range(1, len(path)):
-                ancestor = path[:i]
-                normalized_ancestor = self._normalize_path(ancestor)
-                if normalized_ancestor not in path_to_uid:
-                    paths_to_create.add(normalized_ancestor)
+            for i in range(len(path), 0, -1):
+                prefix = path[:i]
+                if prefix in known:
+                    break
+                known[prefix] = None
 
         # 3. Обрабатываем виртуальные контейнеры
+        # Индекс прямых потомков: родительский путь → дочерние пути
+        children_by_parent: DefaultDict[Tuple[str, ...], List[Tuple[str, ...]]] = defaultdict(list)
+        for path in all_paths:
+            children_by_parent[path[:-1]].append(path)
+
         for virtual_path, uid in path_to_uid.items():
             if len(virtual_path) > 1:
+                # Префикс нормализованного пути уже нормализован
                 parent_path = virtual_path[:-1]
-                normalized_parent = self._normalize_path(parent_path)
-                if normalized_parent not in path_to_uid:
-                    external_children[normalized_parent].append(uid)
-
-            for child_path in all_paths:
-                if (len(child_path) == len(virtual_path) + 1 and
-                        child_path[:len(virtual_path)] == virtual_path):
-                    parent_uid_map[child_path] = uid
-
-        # 4. Удаляем виртуальные контейнеры из создания
-        for virtual_path in path_to_uid.keys():
-            paths_to_create.discard(virtual_path)
-
-        self.logger.info(f"Окончательно путей для создания: {len(paths_to_create)}")
+                if parent_path not in virtual_set:
+                    external_children.setdefault(parent_path, []).append(uid)
+
+            for child_path in children_by_parent.get(virtual_path, ()):
+                parent_uid_map[child_path] = uid
+
+        # 4. Сортировка: сначала по глубине, внутри уровня — по элементам пути.
+        # Кортежи одной длины сравниваются короче, а корзины меньше общего списка.
+        # Родитель по-прежнему идёт раньше своих потомков.
+        # Виртуальные контейнеры не создаются и в результат не попадают.
+        by_depth: DefaultDict[int, List[Tuple[str, ...]]] = defaultdict(list)
+        for path in known:
+            if path not in virtual_set:
+                by_depth[len(path)].append(path)
+        sorted_paths = [
+            path
+            for depth in sorted(by_depth)
+            for path in sorted(by_depth[depth])
+        ]
+
+        self.logger.info("Окончательно путей для создания: %s", len(sorted_paths))
         return (
-            sorted(list(paths_to_create)),
-            dict(external_children),
+            sorted_paths,
+            external_children,
             path_to_cck,
             parent_uid_map
         )
\ No newline at end of file
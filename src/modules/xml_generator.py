@@ -11,11 +11,24 @@
 - GenericPSR: <rh:PowerSystemResource.ccsCode>{ККС}</rh:PowerSystemResource.ccsCode>
 """
 
-from typing import List, Tuple, Dict, Set, Any, Optional
-from uuid import uuid4
+from typing import List, Tuple, Dict, Set, Any, Optional, TextIO, DefaultDict
+from xml.sax.saxutils import escape
+import io
 import logging
+import os
 from collections import defaultdict
-from queue import Queue
+from functools import lru_cache
+
+
+@lru_cache(maxsize=8192)
+def _xml_escape(value: str) -> str:
+    """
+    Экранирует спецсимволы XML (&, <, >, ") в текстовом значении.
+
+    Результат кэшируется: имена сегментов (корпуса, щиты) повторяются
+    у множества соседних узлов.
+    """
+    return escape(value, {'"': '&quot;'})
 
 
 class XMLGenerator:
@@ -62,21 +75,55 @@ class XMLGenerator:
         self.model_version = model.get('version', 'ver:1.0.0')
         self.model_name = model.get('name', 'CIM16')
 
+        # Пролог и FullModel не зависят от данных — собираем их один раз
+        namespace_attrs = ''.join(
+            f' xmlns:{prefix}="{uri}"' for prefix, uri in self.namespaces.items()
+        )
+        self._prolog = (
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<?iec61970-552 version="2.0"?>\n'
+            '<?floatExporter 1?>\n'
+            f'<rdf:RDF{namespace_attrs}>\n'
+        )
+        self._full_model = (
+            f'  <md:FullModel rdf:about="{self.model_id}">\n'
+            f'    <md:Model.created>{self.model_created}</md:Model.created>\n'
+            f'    <md:Model.version>{self.model_version}</md:Model.version>\n'
+            f'    <me:Model.name>{self.model_name}</me:Model.name>\n'
+            '  </md:FullModel>\n'
+        )
+
         self.logger.info("XMLGenerator инициализирован")
 
-    def _generate_id(self, path: Tuple[str, ...]) -> str:
+    def _generate_ids(self, nodes: List[Tuple[str, ...]]) -> Dict[Tuple[str, ...], str]:
         """
-        Генерирует уникальный ID на основе UUID4.
+        Генерирует уникальные ID (UUID4) для всех узлов сразу.
+
+        Случайные байты берутся одним вызовом os.urandom вместо системного
+        вызова и объекта UUID на каждый узел; биты версии и варианта
+        выставляются как в uuid4.
 
         Args:
-            path (tuple): Путь к объекту.
+            nodes (list): Пути к объектам.
 
         Returns:
-            str: ID в формате "#_uuid".
+            dict: Карта: путь → ID в формате "#_uuid".
         """
-        uid = uuid4()
-        self.logger.debug(f"Генерация UUID4 для пути {path}: {uid}")
-        return f"#_{uid}"
+        raw = bytearray(os.urandom(16 * len(nodes)))
+        # Версия 4 (байт 6) и вариант RFC 4122 (байт 8) в каждом 16-байтовом блоке
+        raw[6::16] = bytes((b & 0x0F) | 0x40 for b in raw[6::16])
+        raw[8::16] = bytes((b & 0x3F) | 0x80 for b in raw[8::16])
+        hex_all = raw.hex()
+
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        id_map: Dict[Tuple[str, ...], str] = {}
+        for i, node in enumerate(nodes):
+            h = hex_all[32 * i:32 * i + 32]
+            uid = f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+            if debug:
+                self.logger.debug("Генерация UUID4 для пути %s: %s", node, uid)
+            id_map[node] = f"#_{uid}"
+        return id_map
 
     def generate(
         self,
@@ -101,6 +148,40 @@ class XMLGenerator:
         Returns:
             str: Готовый RDF/XML как строка.
 
+        Raises:
+            ValueError: Если нет данных для генерации.
+        """
+        buf = io.StringIO()
+        self.generate_to(
+            buf,
+            paths=paths,
+            external_children=external_children,
+            parent_uid=parent_uid,
+            cck_map=cck_map,
+            parent_uid_map=parent_uid_map,
+            virtual_containers=virtual_containers
+        )
+        return buf.getvalue()
+
+    def generate_to(
+        self,
+        out: TextIO,
+        paths: List[Tuple[str, ...]],
+        external_children: Dict[Tuple[str, ...], List[str]],
+        parent_uid: str,
+        cck_map: Dict[Tuple[str, ...], str],
+        parent_uid_map: Dict[Tuple[str, ...], str],
+        virtual_containers: Optional[Set[Tuple[str, ...]]] = None
+    ) -> None:
+        """
+        Генерирует XML и пишет его в поток по мере построения элементов.
+
+        В отличие от generate(), документ не собирается целиком в памяти.
+
+        Args:
+            out (TextIO): Текстовый поток для записи (файл, StringIO).
+            Остальные аргументы — как у generate().
+
         Raises:
             ValueError: Если нет данных для генерации.
         """
@@ -113,108 +194,85 @@ class XMLGenerator:
         virtual_containers = virtual_containers or set()
 
         # Построение дерева
-        all_nodes = set(paths)
-        children_map = defaultdict(list)
-        parent_map = {}
+        # dict: уникальные узлы в порядке paths — в этом же порядке они выводятся
+        all_nodes: Dict[Tuple[str, ...], None] = dict.fromkeys(paths)
+        children_map: DefaultDict[Tuple[str, ...], List[Tuple[str, ...]]] = defaultdict(list)
+        parent_map: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+        # Связь родитель → ребёнок есть только между соседними префиксами,
+        # которые оба создаются. Достаточно одного прохода по узлам с одним
+        # срезом node[:-1] на узел. Проверка родителя обязательна: виртуальные
+        # контейнеры в paths не входят. Узлы уникальны, поэтому дети не повторяются.
+        for node in all_nodes:
+            if len(node) > 1:
+                parent = node[:-1]
+                if parent in all_nodes:
+                    children_map[parent].append(node)
+                    parent_map[node] = parent
+
+        id_map = self._generate_ids(list(all_nodes))
+
+        # Тип элемента, ParentObject и строка ККС не зависят от порядка обхода —
+        # вычисляем их одним проходом, чтобы в цикле вывода остались только записи
+        node_info: Dict[Tuple[str, ...], Tuple[str, str, str]] = {}
+        for node in all_nodes:
+            if len(node) == 1 or children_map.get(node):
+                element_type = "cim:AssetContainer"
+            else:
+                element_type = "me:GenericPSR"
 
-        for path in paths:
-            for i in range(1, len(path)):
-                parent = tuple(path[:i])
-                child = tuple(path[:i+1])
-                if parent in paths and child in paths:
-                    if child not in children_map[parent]:
-                        children_map[parent].append(child)
-                    parent_map[child] = parent
+            if len(node) == 1:
+                parent_resource = parent_uid
+            elif node in parent_uid_map:
+                parent_resource = f"#_{parent_uid_map[node]}"
+            elif node in parent_map and parent_map[node] in id_map:
+                parent_resource = id_map[parent_map[node]]
+            else:
+                parent_resource = parent_uid
 
-        id_map = {node: self._generate_id(node) for node in all_nodes}
+            kks_code = cck_map.get(node)
+            if not kks_code:
+                kks_line = ''
+            elif element_type == "cim:AssetContainer":
+                kks_line = f'    <me:IdentifiedObject.mRIDStr>{_xml_escape(kks_code)}</me:IdentifiedObject.mRIDStr>\n'
+            else:
+                kks_line = f'    <rh:PowerSystemResource.ccsCode>{_xml_escape(kks_code)}</rh:PowerSystemResource.ccsCode>\n'
+
+            node_info[node] = (element_type, parent_resource, kks_line)
 
         # Генерация XML
-        lines = []
-        lines.append('<?xml version="1.0" encoding="utf-8"?>')
-        lines.append('<?iec61970-552 version="2.0"?>')
-        lines.append('<?floatExporter 1?>')
-
-        # Открывающий тег RDF
-        rdf_open = '<rdf:RDF'
-        for prefix, uri in self.namespaces.items():
-            rdf_open += f' xmlns:{prefix}="{uri}"'
-        rdf_open += '>'
-        lines.append(rdf_open)
-
-        # FullModel
-        lines.append(f'  <md:FullModel rdf:about="{self.model_id}">')
-        lines.append(f'    <md:Model.created>{self.model_created}</md:Model.created>')
-        lines.append(f'    <md:Model.version>{self.model_version}</md:Model.version>')
-        lines.append(f'    <me:Model.name>{self.model_name}</me:Model.name>')
-        lines.append('  </md:FullModel>')
+        w = out.write
+        # Пролог с открывающим тегом RDF и FullModel
+        w(self._prolog)
+        w(self._full_model)
 
         # Генерация объектов
-        processed = set()
-        q = Queue()
-
-        for path in paths:
-            q.put(path)
-
-        while not q.empty():
-            current = q.get()
-            if current in processed:
-                continue
-            processed.add(current)
-
-            current_id = id_map[current]
-            is_leaf = (current not in children_map or not children_map[current])
-
-            if len(current) == 1:
-                element_type = "cim:AssetContainer"
-            elif is_leaf:
-                element_type = "me:GenericPSR"
-            else:
-                element_type = "cim:AssetContainer"
+        # Каждый узел выводится ровно один раз в порядке paths. Все дети уже
+        # входят в paths, поэтому обход в ширину с очередью не нужен.
+        for current in all_nodes:
+            element_type, parent_resource, kks_line = node_info[current]
 
-            lines.append(f'  <{element_type} rdf:about="{current_id}">')
-            lines.append(f'    <cim:IdentifiedObject.name>{current[-1]}</cim:IdentifiedObject.name>')
-
-            # ParentObject
-            if len(current) == 1:
-                parent_resource = parent_uid
-            else:
-                if current in parent_uid_map:
-                    parent_resource = f"#_{parent_uid_map[current]}"
-                elif current in parent_map and parent_map[current] in id_map:
-                    parent_resource = id_map[parent_map[current]]
-                else:
-                    parent_resource = parent_uid
-
-            lines.append(f'    <me:IdentifiedObject.ParentObject rdf:resource="{parent_resource}" />')
+            w(f'  <{element_type} rdf:about="{id_map[current]}">\n')
+            w(f'    <cim:IdentifiedObject.name>{_xml_escape(current[-1])}</cim:IdentifiedObject.name>\n')
+            w(f'    <me:IdentifiedObject.ParentObject rdf:resource="{parent_resource}" />\n')
 
             # Связи Assets
             if element_type == "cim:AssetContainer":
-                lines.append(f'    <cim:Asset.AssetContainer rdf:resource="{parent_resource}" />')
-            elif element_type == "me:GenericPSR":
-                lines.append(f'    <cim:PowerSystemResource.Assets rdf:resource="{parent_resource}" />')
+                w(f'    <cim:Asset.AssetContainer rdf:resource="{parent_resource}" />\n')
+            else:
+                w(f'    <cim:PowerSystemResource.Assets rdf:resource="{parent_resource}" />\n')
 
             # Запись ККС
-            if current in cck_map and cck_map[current]:
-                kks_code = cck_map[current]
-                if element_type == "cim:AssetContainer":
-                    lines.append(f'    <me:IdentifiedObject.mRIDStr>{kks_code}</me:IdentifiedObject.mRIDStr>')
-                elif element_type == "me:GenericPSR":
-                    lines.append(f'    <rh:PowerSystemResource.ccsCode>{kks_code}</rh:PowerSystemResource.ccsCode>')
+            if kks_line:
+                w(kks_line)
 
             # ChildObjects (только для AssetContainer)
+            # Список детей уже без повторов, и все они есть в id_map
             if element_type == "cim:AssetContainer":
-                added_children = set()
-                if current in children_map:
-                    for child in children_map[current]:
-                        if child in id_map:
-                            child_id = id_map[child]
-                            if child_id not in added_children:
-                                lines.append(f'    <me:IdentifiedObject.ChildObjects rdf:resource="{child_id}" />')
-                                added_children.add(child_id)
-                                q.put(child)
-
-            lines.append(f'  </{element_type}>')
-
-        lines.append('</rdf:RDF>')
-        self.logger.info("Генерация XML завершена")
-        return '\n'.join(lines)
\ No newline at end of file
+                for child in children_map.get(current, ()):
+                    w(f'    <me:IdentifiedObject.ChildObjects rdf:resource="{id_map[child]}" />\n')
+
+            w(f'  </{element_type}>\n')
+
+        w('</rdf:RDF>\n')
+        self.logger.info("Генерация XML завершена")
\ No newline at end of file
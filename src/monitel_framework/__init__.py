@@ -13,7 +13,7 @@ from .logging import (
     FileLogHandler,
     LogManager
 )
-from .utils import resource_path, validate_uuid, ensure_directory, get_file_size
+from .utils import resource_path, validate_uuid, ensure_directory, get_file_size, today_str
 
 __all__ = [
     'BaseMainWindow',
@@ -27,5 +27,6 @@ __all__ = [
     'resource_path',
     'validate_uuid',
     'ensure_directory',
-    'get_file_size'
+    'get_file_size',
+    'today_str'
 ]
\ No newline at end of file
@@ -2,12 +2,136 @@
 Управление конфигурацией приложения.
 """
 
+import atexit
 import json
+import logging
+import sys
+import threading
+import time
+import weakref
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from types import ModuleType
+from typing import Dict, Any, Optional, Tuple
+
+orjson: Optional[ModuleType]
+try:
+    import orjson  # Быстрее стандартного json и работает сразу с bytes
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Кэш разобранных конфигов: путь → (mtime_ns файла, время загрузки, конфиг).
+# Повторное создание ConfigManager в долгоживущем процессе не читает файл,
+# пока он не изменился и не истёк CONFIG_CACHE_TTL.
+CONFIG_CACHE_TTL = 60.0
+_CONFIG_CACHE: Dict[Path, Tuple[int, float, Dict[str, Any]]] = {}
+_CONFIG_CACHE_LOCK = threading.Lock()
+
+# set() не пишет файл сразу: серия изменений сохраняется одной записью
+# через SAVE_DELAY секунд после последнего изменения (или при flush())
+SAVE_DELAY = 0.5
+_PENDING_SAVES: "weakref.WeakSet[ConfigManager]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_pending_saves() -> None:
+    """Дописывает несохранённые изменения конфигов при завершении процесса."""
+    for manager in list(_PENDING_SAVES):
+        try:
+            manager.flush()
+        except Exception as e:
+            # Остальные конфиги всё равно сохраняем
+            logger.error("Не удалось сохранить конфигурацию %s: %s", manager.config_path, e)
+
+
+def _clone(value: Any) -> Any:
+    """Копирует вложенные dict и list; остальные значения неизменяемы и общие."""
+    if isinstance(value, dict):
+        return {key: _clone(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_clone(item) for item in value]
+    return value
+
+
+def _intern_keys(value: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Интернирует строковые ключи вложенных dict, разобранных из JSON.
+
+    Ключи из json/orjson — новые строки; интернированные совпадают по
+    идентичности с ключами из _split_key, и поиск в dict не сравнивает
+    строки посимвольно.
+    """
+    return {
+        (sys.intern(key) if isinstance(key, str) else key):
+            (_intern_keys(item) if isinstance(item, dict) else item)
+        for key, item in value.items()
+    }
+
+
+@lru_cache(maxsize=256)
+def _split_key(key_path: str) -> Tuple[str, ...]:
+    """Разбивает путь вида 'csv.headers.path' на ключи; набор путей мал и повторяется."""
+    return tuple(sys.intern(key) for key in key_path.split('.'))
+
+
+# Конфигурация по умолчанию. Не изменяется: наружу отдаются только копии (_clone)
+_DEFAULT_CONFIG: Dict[str, Any] = {
+    "app": {
+        "name": "CSV-to-RDF Converter",
+        "version": "1.0.0"
+    },
+    "io": {
+        "input_dir": "input",
+        "output_dir": "output",
+        "log_dir": "logs",
+        "exclude_files": ["Sample.csv"],
+        "default_encoding": "utf-8-sig",
+        "allowed_encodings": ["utf-8-sig", "utf-8", "cp1251", "windows-1251"]
+    },
+    "logging": {
+        "level": "INFO",
+        "format": "%(asctime)s [%(levelname)s]: %(message)s",
+        "date_format": "%Y-%m-%d %H:%M:%S",
+        "file": None
+    },
+    "csv": {
+        "headers": {
+            "path": "НаименованиеКонтейнераОборудования",
+            "uid": "uid",
+            "cck_code": "ОбъектРемонтаКодККС"
+        },
+        "delimiter": "auto"
+    },
+    "xml": {
+        "namespaces": {
+            "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+            "md": "http://iec.ch/TC57/61970-552/ModelDescription/1#",
+            "cim": "http://iec.ch/TC57/2014/CIM-schema-cim16#",
+            "cim17": "http://iec.ch/TC57/CIM100#",
+            "me": "http://monitel.com/2014/schema-cim16#",
+            "rf": "http://gost.ru/2019/schema-cim01#",
+            "rh": "http://rushydro.ru/2015/schema-cim16#",
+            "so": "http://so-ups.ru/2015/schema-cim16#"
+        },
+        "model": {
+            "id": "00000000-0000-0000-0000-000000000000",
+            "created": "2025-01-01T00:00:00.0000000Z",
+            "version": "ver:1.0.0",
+            "name": "CIM16"
+        }
+    }
+}
+
 
 class ConfigManager:
-    """Менеджер конфигурации без глобального состояния."""
+    """
+    Менеджер конфигурации.
+
+    Каждый экземпляр работает со своей копией конфига; общий между
+    экземплярами только кэш разобранных файлов.
+    """
     
     def __init__(self, config_path: str = "config.json"):
         """
@@ -17,10 +141,15 @@ class ConfigManager:
             config_path: путь к файлу конфигурации
         """
         self.config_path = Path(config_path)
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        self._save_lock = threading.Lock()
+        # Ошибка отложенного сохранения; выбрасывается следующим flush()
+        self._save_error: Optional[Exception] = None
         self._config = self._load_config()
     
     def _load_config(self) -> Dict[str, Any]:
-        """Загружает конфигурацию из файла."""
+        """Загружает конфигурацию из файла (или из кэша, если файл не менялся)."""
         if not self.config_path.exists():
             default_config = self._get_default_config()
             # Сохраняем дефолтный конфиг
@@ -28,88 +157,69 @@ class ConfigManager:
             return default_config
         
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                user_config = json.load(f)
+            cache_key = self.config_path.resolve()
+            mtime_ns = self.config_path.stat().st_mtime_ns
+            with _CONFIG_CACHE_LOCK:
+                cached = _CONFIG_CACHE.get(cache_key)
+            if cached is not None:
+                cached_mtime_ns, loaded_at, cached_config = cached
+                if cached_mtime_ns == mtime_ns and time.monotonic() - loaded_at < CONFIG_CACHE_TTL:
+                    return _clone(cached_config)
+
+            data = self.config_path.read_bytes()
+            user_config = _intern_keys(orjson.loads(data) if orjson else json.loads(data))
             # Сливаем с дефолтами
-            return self._merge_with_defaults(user_config)
+            merged = self._merge_with_defaults(user_config)
+            # mtime до чтения: если файл изменили во время чтения, запись
+            # в кэше окажется устаревшей и следующая загрузка прочитает файл
+            self._store_in_cache(merged, mtime_ns)
+            return merged
         except Exception as e:
             raise Exception(f"Ошибка загрузки конфигурации: {e}")
+
+    def _store_in_cache(self, config: Dict[str, Any], mtime_ns: int) -> None:
+        """Запоминает копию конфига вместе с mtime файла, из которого он получен."""
+        entry = (mtime_ns, time.monotonic(), _clone(config))
+        with _CONFIG_CACHE_LOCK:
+            _CONFIG_CACHE[self.config_path.resolve()] = entry
     
     def _get_default_config(self) -> Dict[str, Any]:
         """Возвращает конфигурацию по умолчанию."""
-        return {
-            "app": {
-                "name": "CSV-to-RDF Converter",
-                "version": "1.0.0"
-            },
-            "io": {
-                "input_dir": "input",
-                "output_dir": "output",
-                "log_dir": "logs",
-                "exclude_files": ["Sample.csv"],
-                "default_encoding": "utf-8-sig",
-                "allowed_encodings": ["utf-8-sig", "utf-8", "cp1251", "windows-1251"]
-            },
-            "logging": {
-                "level": "INFO",
-                "format": "%(asctime)s [%(levelname)s]: %(message)s",
-                "date_format": "%Y-%m-%d %H:%M:%S",
-                "file": None
-            },
-            "csv": {
-                "headers": {
-                    "path": "НаименованиеКонтейнераОборудования",
-                    "uid": "uid",
-                    "cck_code": "ОбъектРемонтаКодККС"
-                },
-                "delimiter": "auto"
-            },
-            "xml": {
-                "namespaces": {
-                    "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
-                    "md": "http://iec.ch/TC57/61970-552/ModelDescription/1#",
-                    "cim": "http://iec.ch/TC57/2014/CIM-schema-cim16#",
-                    "cim17": "http://iec.ch/TC57/CIM100#",
-                    "me": "http://monitel.com/2014/schema-cim16#",
-                    "rf": "http://gost.ru/2019/schema-cim01#",
-                    "rh": "http://rushydro.ru/2015/schema-cim16#",
-                    "so": "http://so-ups.ru/2015/schema-cim16#"
-                },
-                "model": {
-                    "id": "00000000-0000-0000-0000-000000000000",
-                    "created": "2025-01-01T00:00:00.0000000Z",
-                    "version": "ver:1.0.0",
-                    "name": "CIM16"
-                }
-            }
-        }
+        return _clone(_DEFAULT_CONFIG)
     
     def _merge_with_defaults(self, user_config: Dict[str, Any]) -> Dict[str, Any]:
-        """Рекурсивно объединяет пользовательскую конфигурацию с дефолтной."""
-        from copy import deepcopy
-        merged = deepcopy(self._get_default_config())
-        
-        def merge(a: dict, b: dict):
-            for key, value in b.items():
-                if key in a and isinstance(a[key], dict) and isinstance(value, dict):
-                    merge(a[key], value)
+        """Объединяет пользовательскую конфигурацию с дефолтной на всю глубину."""
+        # _get_default_config уже возвращает свежую копию — deepcopy не нужен,
+        # а значения из user_config только что разобраны и ни с кем не общие
+        merged = self._get_default_config()
+
+        # Обход стеком пар (куда, откуда) вместо рекурсивной функции
+        stack = [(merged, user_config)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                current = target.get(key)
+                if isinstance(current, dict) and isinstance(value, dict):
+                    stack.append((current, value))
                 else:
-                    a[key] = value
-            return a
-        
-        return merge(merged, user_config)
+                    target[key] = value
+
+        return merged
     
     def _save_config(self, config: Dict[str, Any]) -> None:
         """Сохраняет конфигурацию в файл."""
         try:
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            if orjson:
+                data = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(config, indent=2, ensure_ascii=False).encode('utf-8')
+            self.config_path.write_bytes(data)
         except Exception as e:
             raise Exception(f"Ошибка сохранения конфигурации: {e}")
     
     def get(self, key_path: str, default: Any = None) -> Any:
         """Получает значение по пути к ключу."""
-        keys = key_path.split('.')
+        keys = _split_key(key_path)
         value = self._config
         
         try:
@@ -120,20 +230,96 @@ class ConfigManager:
             return default
     
     def set(self, key_path: str, value: Any) -> None:
-        """Устанавливает значение по пути к ключу."""
-        keys = key_path.split('.')
-        config = self._config
-        
-        for key in keys[:-1]:
-            if key not in config:
-                config[key] = {}
-            config = config[key]
-        
-        config[keys[-1]] = value
+        """
+        Устанавливает значение по пути к ключу.
+
+        Файл сохраняется отложенно, через SAVE_DELAY секунд после последнего
+        изменения; flush() сохраняет немедленно.
+        """
+        keys = _split_key(key_path)
+
+        with self._save_lock:
+            config = self._config
+            for key in keys[:-1]:
+                if key not in config:
+                    config[key] = {}
+                config = config[key]
+
+            config[keys[-1]] = value
+            self._dirty = True
+
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(SAVE_DELAY, self._flush_from_timer)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+        _PENDING_SAVES.add(self)
+
+    def flush(self) -> None:
+        """
+        Сохраняет в файл изменения, сделанные через set().
+
+        Raises:
+            Exception: если не удалось сохранение — текущее или отложенное,
+                выполнявшееся по таймеру. Изменения остаются несохранёнными,
+                следующий flush() повторит попытку.
+        """
+        with self._save_lock:
+            error, self._save_error = self._save_error, None
+            if error is not None:
+                raise error
+            self._save_pending()
+        _PENDING_SAVES.discard(self)
+
+    def _flush_from_timer(self) -> None:
+        """Отложенное сохранение; ошибку запоминает для следующего flush()."""
+        try:
+            with self._save_lock:
+                self._save_pending()
+        except Exception as e:
+            logger.error("Отложенное сохранение конфигурации %s не удалось: %s", self.config_path, e)
+            with self._save_lock:
+                self._save_error = e
+            return
+        _PENDING_SAVES.discard(self)
+
+    def _save_pending(self) -> None:
+        """Записывает несохранённые изменения; вызывается под _save_lock."""
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+        if not self._dirty:
+            return
         self._save_config(self._config)
-    
+        self._store_in_cache(self._config, self.config_path.stat().st_mtime_ns)
+        self._dirty = False
+        self._save_error = None  # Прежняя ошибка устарела: изменения записаны
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Состояние для pickle (например, передача в дочерний процесс).
+
+        Блокировка, таймер и ошибка отложенного сохранения не сериализуются.
+        Файл не записывается: несохранённые изменения (_dirty) переходят
+        в копию и сохраняются её явным flush().
+        """
+        state = self.__dict__.copy()
+        del state['_save_lock']
+        del state['_save_timer']
+        del state['_save_error']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._save_timer = None
+        self._save_lock = threading.Lock()
+        self._save_error = None
+
     def reload(self) -> None:
-        """Перезагружает конфигурацию из файла."""
+        """Перезагружает конфигурацию из файла, минуя кэш."""
+        self.flush()  # Несохранённые изменения set() не теряются
+        with _CONFIG_CACHE_LOCK:
+            _CONFIG_CACHE.pop(self.config_path.resolve(), None)
         self._config = self._load_config()
     
     @property
@@ -2,10 +2,12 @@
 Управление файлами и директориями.
 """
 
+import os
 import sys
 from pathlib import Path
-from typing import List, Optional, Tuple
-from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+from .utils import today_str
 
 class FileManager:
     """Класс для управления файлами и директориями."""
@@ -20,27 +22,64 @@ class FileManager:
         """
         self.base_directory = Path(base_directory).resolve()
         self.log_directory = log_directory 
+        self._log_dir = self.base_directory / log_directory
+        self._log_dir_ready = False  # Папка логов уже создана этим экземпляром
     
-    def get_csv_files(self, exclude_files: Optional[List[str]] = None) -> List[Path]:
+    def _iter_csv_entries(self, exclude_files: Optional[List[str]]) -> Iterator[Tuple[str, str]]:
+        """Перебирает CSV файлы базовой директории как пары (имя, путь) в порядке каталога."""
+        if exclude_files is None:
+            exclude_files = ["Sample.csv"]
+        exclude_files_lower = frozenset(f.lower() for f in exclude_files)
+        # os.scandir отдаёт тип записи из readdir — без stat() на каждый файл.
+        # Для проверки расширения в нижний регистр переводятся только последние
+        # 4 символа; полное имя — лишь у CSV, для сверки с исключениями.
+        # Дешёвые проверки имени идут раньше is_file()
+        with os.scandir(self.base_directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if (name[-4:].lower() == '.csv'
+                        and name.lower() not in exclude_files_lower
+                        and entry.is_file()):
+                    yield name, entry.path
+
+    def get_csv_files(
+        self,
+        exclude_files: Optional[List[str]] = None,
+        sort: bool = True
+    ) -> List[Path]:
         """
         Получает список CSV файлов в базовой директории.
 
         Args:
             exclude_files: список файлов для исключения
+            sort: упорядочить по имени (False — в порядке каталога, без сортировки)
 
         Returns:
             List[str]: список имен CSV файлов
         """
-        if exclude_files is None:
-            exclude_files = ["Sample.csv"]
-        exclude_files_lower = [f.lower() for f in exclude_files]
-        csv_files = []
-        for file_path in self.base_directory.iterdir():
-            if (file_path.is_file() and
-                file_path.suffix.lower() == '.csv' and
-                file_path.name.lower() not in exclude_files_lower):
-                csv_files.append(file_path)  # ← Path, а не str
-        return sorted(csv_files)
+        found = list(self._iter_csv_entries(exclude_files))
+        if sort:
+            # Все файлы из одной папки: порядок Path совпадает с порядком имён
+            # (normcase повторяет регистронезависимое сравнение на Windows),
+            # а строки сравниваются быстрее, чем кортежи частей Path
+            found.sort(key=lambda item: os.path.normcase(item[0]))
+        return [Path(path) for _, path in found]  # ← Path, а не str
+
+    def iter_csv_files(self, exclude_files: Optional[List[str]] = None) -> Iterator[Path]:
+        """
+        Перебирает CSV файлы в базовой директории по мере чтения каталога.
+
+        В отличие от get_csv_files(), список не собирается и не сортируется:
+        файлы отдаются в порядке каталога.
+
+        Args:
+            exclude_files: список файлов для исключения
+
+        Yields:
+            Path: путь к CSV файлу
+        """
+        for _, path in self._iter_csv_entries(exclude_files):
+            yield Path(path)
     
     def create_log_directory(self) -> str:
         """
@@ -49,9 +88,9 @@ class FileManager:
         Returns:
             str: путь к директории логов
         """
-        log_dir = self.base_directory / self.log_directory
-        log_dir.mkdir(exist_ok=True)
-        return str(log_dir)
+        self._log_dir.mkdir(exist_ok=True)
+        self._log_dir_ready = True
+        return str(self._log_dir)
     
     def get_file_paths(self, filename: str) -> Tuple[Path, Path]:
         """
@@ -86,16 +125,57 @@ class FileManager:
         Returns:
             str: путь к лог-файлу
         """
-        log_dir = self.base_directory / self.log_directory
-        log_dir.mkdir(exist_ok=True)
+        # mkdir — только при первом обращении, а не для каждого файла
+        if not self._log_dir_ready:
+            self._log_dir.mkdir(exist_ok=True)
+            self._log_dir_ready = True
         
         basename = Path(csv_filename).stem
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        return log_dir / f"{basename}_{date_str}.log"
+        return self._log_dir / f"{basename}_{today_str()}.log"
 
 
 class CLIManager:
     """Класс для управления командной строкой."""
+
+    JOBS_FLAG = "--jobs"
+
+    @staticmethod
+    def _positional_args() -> List[str]:
+        """Аргументы командной строки без флага --jobs и его значения."""
+        args = []
+        skip_next = False
+        for arg in sys.argv[1:]:
+            if skip_next:
+                skip_next = False
+            elif arg == CLIManager.JOBS_FLAG:
+                skip_next = True
+            elif not arg.startswith(CLIManager.JOBS_FLAG + "="):
+                args.append(arg)
+        return args
+
+    @staticmethod
+    def get_jobs() -> Optional[int]:
+        """
+        Получает число параллельных процессов из флага --jobs N (или --jobs=N).
+
+        Returns:
+            Optional[int]: число процессов или None, если флаг не задан или некорректен
+        """
+        args = sys.argv[1:]
+        for i, arg in enumerate(args):
+            if arg == CLIManager.JOBS_FLAG and i + 1 < len(args):
+                value = args[i + 1]
+            elif arg.startswith(CLIManager.JOBS_FLAG + "="):
+                value = arg.split("=", 1)[1]
+            else:
+                continue
+            try:
+                jobs = int(value)
+            except ValueError:
+                print(f"Некорректное значение {CLIManager.JOBS_FLAG}: {value}")
+                return None
+            return jobs if jobs > 0 else None
+        return None
     
     @staticmethod
     def get_cli_parameters() -> Tuple[str, str]:
@@ -108,9 +188,10 @@ class CLIManager:
         print("="*50)
         print("Пакетный конвертер CSV ➔ XML (поточн. генерация XML)")
         
-        if len(sys.argv) >= 3:
-            folder_uid = sys.argv[1]
-            csv_dir = sys.argv[2]
+        args = CLIManager._positional_args()
+        if len(args) >= 2:
+            folder_uid = args[0]
+            csv_dir = args[1]
         else:
             folder_uid = input('Введите UID папки для ролей: ').strip()
             csv_dir = input('Укажите папку с CSV (или . для текущей): ').strip() or '.'
@@ -132,14 +213,18 @@ class CLIManager:
             print(f"Папка не найдена: {file_manager.base_directory}")
             return []
         
-        csv_files = file_manager.get_csv_files()
+        # Файлы выводятся по мере чтения каталога, не дожидаясь полного списка
+        csv_files = []
+        for csv_file in file_manager.iter_csv_files():
+            if not csv_files:
+                print("Будут обработаны файлы:")
+            print(f"   {csv_file}")
+            csv_files.append(csv_file)
+
         if not csv_files:
             print("Нет подходящих .csv файлов")
             return []
-        
-        print("Будут обработаны файлы:")
-        for f in csv_files:
-            print("  ", f)
+
         print("-"*25)
         
         return csv_files
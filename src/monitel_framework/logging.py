@@ -10,12 +10,31 @@
 
 import logging
 import logging.handlers
-from typing import Optional, Callable, Dict, Any
+import queue
+from functools import lru_cache
+from typing import Optional, Callable, Dict, Any, Set, Tuple
 from pathlib import Path
 
 
+@lru_cache(maxsize=32)
+def _get_formatter(format_string: str, date_format: str) -> logging.Formatter:
+    """
+    Возвращает общий Formatter для пары (формат, формат даты).
+
+    Formatter только читает своё состояние при форматировании, поэтому один
+    экземпляр безопасно разделяется между обработчиками и потоками.
+    """
+    return logging.Formatter(fmt=format_string, datefmt=date_format)
+
+
 class LoggerConfig:
-    """Конфигурация формата и уровня логирования."""
+    """
+    Конфигурация формата и уровня логирования.
+
+    Сообщения передаются в логгер с ленивой подстановкой:
+    logger.info("Найдено файлов: %s", count), а не f-строкой. Тогда строка
+    собирается только для записей, прошедших фильтр по уровню.
+    """
     def __init__(
         self,
         level: int = logging.INFO,
@@ -25,15 +44,35 @@ class LoggerConfig:
         self.level = level
         self.format_string = format_string
         self.date_format = date_format
-        self.formatter = logging.Formatter(fmt=format_string, datefmt=date_format)
+        self.formatter = _get_formatter(format_string, date_format)
+
+
+# Папки логов, уже созданные в этом процессе
+_ENSURED_LOG_DIRS: Set[Path] = set()
 
 
 class FileLogHandler(logging.FileHandler):
-    """Обработчик для записи логов в файл."""
-    def __init__(self, filename: str, mode: str = 'a', encoding: str = 'utf-8', delay: bool = False):
-        Path(filename).parent.mkdir(parents=True, exist_ok=True)
+    """
+    Обработчик для записи логов в файл.
+
+    Файл (и его папка) открывается при первой записи: логгер, который так
+    ничего и не записал, не создаёт пустой файл.
+    """
+    def __init__(self, filename: str, mode: str = 'a', encoding: str = 'utf-8', delay: bool = True):
         super().__init__(filename, mode, encoding, delay)
 
+    def _open(self):
+        parent = Path(self.baseFilename).parent
+        if parent not in _ENSURED_LOG_DIRS:
+            parent.mkdir(parents=True, exist_ok=True)
+            _ENSURED_LOG_DIRS.add(parent)
+        try:
+            return super()._open()
+        except FileNotFoundError:
+            # Папку удалили после первого создания — создаём заново
+            parent.mkdir(parents=True, exist_ok=True)
+            return super()._open()
+
 
 class UILogHandler(logging.Handler):
     """Обработчик для передачи логов в GUI."""
@@ -46,7 +85,7 @@ class UILogHandler(logging.Handler):
     ):
         super().__init__(level)
         self.callback = callback
-        self.formatter = logging.Formatter(fmt=format_string, datefmt=date_format)
+        self.formatter = _get_formatter(format_string, date_format)
 
     def emit(self, record: logging.LogRecord) -> None:
         try:
@@ -56,11 +95,42 @@ class UILogHandler(logging.Handler):
             self.handleError(record)
 
 
+class _ListenerQueueHandler(logging.handlers.QueueHandler):
+    """
+    Обработчик-очередь, владеющий фоновым потоком (QueueListener).
+
+    Закрытие обработчика останавливает поток, дописывая накопленные записи,
+    и закрывает обработчики потока (в том числе файл лога). Так логгер
+    освобождается обычным handler.close() или logging.shutdown().
+    """
+    def __init__(self, records: "queue.SimpleQueue[logging.LogRecord]", *handlers: logging.Handler):
+        super().__init__(records)
+        self.listener: Optional[logging.handlers.QueueListener] = logging.handlers.QueueListener(
+            records, *handlers, respect_handler_level=True
+        )
+        self.listener.start()
+
+    def close(self) -> None:
+        self.acquire()
+        try:
+            # Повторное закрытие (например, из logging.shutdown) ничего не делает
+            listener, self.listener = self.listener, None
+        finally:
+            self.release()
+        if listener is not None:
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+        super().close()
+
+
 class LoggerManager:
     """Менеджер логгеров — централизованное создание и управление."""
     def __init__(self, default_config: LoggerConfig):
         self.default_config = default_config
         self.loggers: Dict[str, logging.Logger] = {}
+        # name → параметры, с которыми логгер был настроен этим менеджером
+        self._logger_params: Dict[str, Tuple[Any, ...]] = {}
 
     def create_logger(
         self,
@@ -69,8 +139,26 @@ class LoggerManager:
         ui_callback: Optional[Callable[[str], None]] = None,
         config: Optional[LoggerConfig] = None
     ) -> logging.Logger:
+        """
+        Создаёт (или перенастраивает) логгер с выводом в консоль, файл и UI.
+
+        При заданном ui_callback логгер считается логгером GUI: обработчики
+        UI и файла работают в фоновом потоке (QueueListener), а вызывающий
+        поток только кладёт запись в очередь.
+        """
         config = config or self.default_config
+
+        # Логгер с теми же параметрами уже настроен — не пересоздаём обработчики
+        # и не открываем файл лога заново. Колбэк и конфиг сравниваются по
+        # идентичности; ссылки на них в ключе держат объекты живыми.
+        params = (log_file_path, ui_callback, config)
+        cached = self.loggers.get(name)
+        if cached is not None and self._logger_params.get(name) == params:
+            return cached
+
         logger = logging.getLogger(name)
+        for handler in logger.handlers:
+            handler.close()  # Освобождаем файл лога прежней настройки
         logger.handlers.clear()
         logger.setLevel(config.level)
         logger.propagate = False
@@ -80,11 +168,11 @@ class LoggerManager:
         console_handler.setFormatter(config.formatter)
         logger.addHandler(console_handler)
 
+        file_handler = None
         if log_file_path:
             file_handler = FileLogHandler(log_file_path, mode="a", encoding="utf-8")
             file_handler.setLevel(config.level)
             file_handler.setFormatter(config.formatter)
-            logger.addHandler(file_handler)
 
         if ui_callback:
             ui_handler = UILogHandler(
@@ -93,38 +181,49 @@ class LoggerManager:
                 format_string=config.format_string,
                 date_format=config.date_format
             )
-            logger.addHandler(ui_handler)
+            # Колбэк UI (сигнал Qt и т.п.) и запись в файл выполняются в фоновом
+            # потоке: поток GUI только кладёт запись в очередь и не ждёт диска
+            queued = [ui_handler] if file_handler is None else [file_handler, ui_handler]
+            logger.addHandler(_ListenerQueueHandler(queue.SimpleQueue(), *queued))
+        elif file_handler is not None:
+            logger.addHandler(file_handler)
 
         self.loggers[name] = logger
+        self._logger_params[name] = params
         return logger
 
     def cleanup_all_loggers(self):
         """Очистка всех обработчиков."""
         for logger in self.loggers.values():
+            for handler in logger.handlers:
+                handler.close()  # Останавливает и фоновые потоки UI-логгеров
             logger.handlers.clear()
         self.loggers.clear()
+        self._logger_params.clear()
+
+
+# Общий менеджер логгеров процесса; создаётся при первом обращении
+_DEFAULT_MANAGER: Optional[LoggerManager] = None
+
+
+def _default_manager() -> LoggerManager:
+    """Возвращает общий LoggerManager, создавая его при первом вызове."""
+    global _DEFAULT_MANAGER
+    manager = _DEFAULT_MANAGER
+    if manager is None:
+        manager = _DEFAULT_MANAGER = LoggerManager(LoggerConfig())
+    return manager
 
 
 class LogManager:
     """Синглтон для глобального доступа к менеджеру логгеров."""
     _instance = None
-    _manager: Optional[LoggerManager] = None
 
     def __new__(cls) -> 'LogManager':
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    @classmethod
-    def _ensure_manager(cls) -> None:
-        if cls._manager is None:
-            default_config = LoggerConfig(
-                level=logging.INFO,
-                format_string="%(asctime)s [%(levelname)s]: %(message)s",
-                date_format="%Y-%m-%d %H:%M:%S"
-            )
-            cls._manager = LoggerManager(default_config)
-
     @classmethod
     def get_logger(
         cls,
@@ -132,12 +231,8 @@ class LogManager:
         log_file_path: Optional[str] = None,
         ui_callback: Optional[Callable[[str], None]] = None
     ) -> logging.Logger:
-        cls._ensure_manager()
-        assert cls._manager is not None
-        return cls._manager.create_logger(name, log_file_path, ui_callback)
+        return _default_manager().create_logger(name, log_file_path, ui_callback)
 
     @classmethod
     def get_manager(cls) -> LoggerManager:
-        cls._ensure_manager()
-        assert cls._manager is not None
-        return cls._manager
\ No newline at end of file
+        return _default_manager()
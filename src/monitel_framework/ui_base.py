@@ -5,8 +5,10 @@
 
 import logging
 import sys
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List, Union
+from typing import Deque, Dict, Optional, List, Tuple, Union
 
 # PyQt6
 try:
@@ -15,7 +17,7 @@ try:
         QPushButton, QLabel, QLineEdit, QFileDialog, QScrollArea,
         QCheckBox, QPlainTextEdit, QGroupBox, QProgressBar
     )
-    from PyQt6.QtCore import Qt, QObject, pyqtSignal, QProcess
+    from PyQt6.QtCore import Qt, QProcess, QTimer
     from PyQt6.QtGui import QFont
 except ImportError as e:
     raise ImportError("Требуется PyQt6. Установите: pip install PyQt6") from e
@@ -23,17 +25,70 @@ except ImportError as e:
 # Фреймворк
 from .config import ConfigManager
 from .files import FileManager
-from .logging import LoggerConfig, LoggerManager, UILogHandler, FileLogHandler
-
-
-class LogSignal(QObject):
-    """Сигнал для потокобезопасной передачи логов."""
-    message = pyqtSignal(str)
+from .logging import LoggerConfig, LoggerManager
+from .utils import today_str
+
+
+# Цвета тем; стили собираются по ним один раз (см. _theme_stylesheets)
+_DARK_COLORS: Dict[str, str] = {
+    "bg": "#1a1a1a", "bg_card": "#252526", "fg": "#ffffff",
+    "accent": "#007acc", "accent_hover": "#005a9e", "border": "#3c3c3c",
+    "scroll": "#2d2d2d", "log_bg": "#1e1e1e", "log_text": "#dcdcdc",
+    "folder_btn": "#006699", "folder_btn_hover": "#0088cc"
+}
+_LIGHT_COLORS: Dict[str, str] = {
+    "bg": "#f0f0f0", "bg_card": "#ffffff", "fg": "#333333",
+    "accent": "#0056b3", "accent_hover": "#003d82", "border": "#cccccc",
+    "scroll": "#e0e0e0", "log_bg": "#f9f9f9", "log_text": "#111111",
+    "folder_btn": "#006699", "folder_btn_hover": "#0088cc"
+}
+
+
+@lru_cache(maxsize=8)
+def _theme_stylesheets(color_items: Tuple[Tuple[str, str], ...]) -> Tuple[str, str]:
+    """
+    Собирает стили окна и окна лога для набора цветов.
+
+    Результат кэшируется: переключение темы и новые окна берут готовые строки.
+
+    Returns:
+        tuple: (стиль окна, стиль окна лога)
+    """
+    colors = dict(color_items)
+    font_family = "Segoe UI, Arial, sans-serif"
+    font_size = 10
+
+    window_style = f"""
+        QMainWindow {{ background: {colors['bg']}; color: {colors['fg']}; font-family: '{font_family}'; font-size: {font_size}pt; }}
+        QLabel {{ color: {colors['fg']}; font-weight: 500; }}
+        QLineEdit {{ padding: 12px; border: 1px solid {colors['border']}; border-radius: 10px; background: {colors['bg_card']}; }}
+        QLineEdit:focus {{ border: 2px solid {colors['accent']}; }}
+        QGroupBox {{ border: 1px solid {colors['border']}; border-radius: 12px; margin-top: 20px; padding: 15px; background: {colors['bg_card']}; }}
+        QGroupBox::title {{ subcontrol-origin: margin; subcontrol-position: top left; padding: 0 8px; }}
+        QPushButton {{ min-height: 24px; padding: 10px 16px; border-radius: 10px; font-weight: 600; font-size: 11pt; border: none; }}
+        QPushButton#run_button {{ background: {colors['accent']}; color: white; }}
+        QPushButton#run_button:hover {{ background: {colors['accent_hover']}; transform: scale(1.03); transition: all 0.2s ease; }}
+        QPushButton#browse_button {{ background: {colors['folder_btn']}; color: white; }}
+        QPushButton#browse_button:hover {{ background: {colors['folder_btn_hover']}; transform: scale(1.03); transition: all 0.2s ease; }}
+        QPushButton#folder_button {{ background: #555; color: white; }}
+        QPushButton#folder_button:hover {{ background: #777; }}
+        QProgressBar::chunk {{ background: {colors['accent']}; border-radius: 4px; }}
+        QPlainTextEdit {{ background: {colors['log_bg']}; color: {colors['log_text']}; border: 1px solid {colors['border']}; border-radius: 10px; font-family: 'Consolas', monospace; font-size: 9pt; }}
+        QScrollBar:vertical {{ width: 10px; background: {colors['scroll']}; border-radius: 5px; }}
+        QScrollBar::handle:vertical {{ background: {colors['border']}; border-radius: 5px; }}
+        QScrollBar::handle:vertical:hover {{ background: {colors['accent']}; }}
+        QCheckBox {{ color: {colors['fg']}; font-weight: 500; }}
+    """
+    log_style = f"background: {colors['log_bg']}; color: {colors['log_text']};"
+    return window_style, log_style
 
 
 class BaseMainWindow(QMainWindow):
     """Базовое окно с поддержкой тем, логирования и современного стиля."""
 
+    LOG_FLUSH_INTERVAL_MS = 50  # Период вывода накопленных сообщений в окно лога
+    LOG_FLUSH_BATCH = 500       # Максимум сообщений за один вывод
+
     def __init__(self, config_file: str = "config.json"):
         super().__init__()
         print("🔧 BaseMainWindow.__init__ вызван")
@@ -57,6 +112,9 @@ class BaseMainWindow(QMainWindow):
         self.logger: Optional[logging.Logger] = None
         self.file_checkboxes: List[Union[QCheckBox, QLabel]] = []
         self.log_dir_path: Optional[Path] = None
+        # Папка из dir_input, существование которой уже проверено;
+        # сбрасывается при изменении текста поля
+        self._current_dir: Optional[Path] = None
         self.is_dark_theme = True
 
         self._setup_ui()
@@ -88,6 +146,7 @@ class BaseMainWindow(QMainWindow):
         dir_layout.addWidget(QLabel("CSV папка:"))
         self.dir_input = QLineEdit()
         self.dir_input.setPlaceholderText("Выберите папку...")
+        self.dir_input.textChanged.connect(self._invalidate_current_dir)
         dir_layout.addWidget(self.dir_input)
 
         self.browse_btn = QPushButton("📁 Выбрать папку")
@@ -149,6 +208,9 @@ class BaseMainWindow(QMainWindow):
         self.log_text.setReadOnly(True)
         self.log_text.setMinimumHeight(250)
         self.log_text.setLineWrapMode(QPlainTextEdit.LineWrapMode.WidgetWidth)
+        # Ограничение числа строк: старые удаляются, память и время
+        # добавления не растут при длительной работе
+        self.log_text.setMaximumBlockCount(self.config.get("logging.ui_max_blocks", 5000))
         log_layout.addWidget(self.log_text)
 
         log_group.setLayout(log_layout)
@@ -182,76 +244,41 @@ class BaseMainWindow(QMainWindow):
         log_dir_name = self.config.get("io.log_dir", "log")
         assert isinstance(log_dir_name, str)
 
+        # Папку и файл лога создаёт FileLogHandler при первой записи
+        # (в фоновом потоке логгера), а не поток GUI при запуске
         self.log_dir_path = base_dir / log_dir_name
-        self.log_dir_path.mkdir(parents=True, exist_ok=True)
 
-        from datetime import datetime
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        gui_log_path = self.log_dir_path / f"gui_{date_str}.log"
-
-        self.logger = self.logger_manager.create_logger("gui", ui_callback=lambda msg: None)
+        gui_log_path = self.log_dir_path / f"gui_{today_str()}.log"
+
+        # Сообщения копятся в очереди (deque.append потокобезопасен) и выводятся
+        # в окно лога пачкой по таймеру в потоке GUI — одно изменение документа
+        # за тик вместо вызова слота на каждую запись
+        self._log_queue: Deque[str] = deque()
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setInterval(self.LOG_FLUSH_INTERVAL_MS)
+        self._log_flush_timer.timeout.connect(self._flush_log)
+        self._log_flush_timer.start()
+
+        # Обработчики UI и файла создаёт LoggerManager: записи идут через
+        # очередь в фоновый поток, который пишет файл и кладёт строки в _log_queue
+        self.logger = self.logger_manager.create_logger(
+            "gui",
+            log_file_path=str(gui_log_path),
+            ui_callback=self._log_queue.append
+        )
         assert self.logger is not None
         self.logger.setLevel(log_level)
 
-        self.log_signal = LogSignal()
-        self.log_signal.message.connect(self.append_log)
-
-        def log_callback(msg: str):
-            self.log_signal.message.emit(msg)
-
-        ui_handler = UILogHandler(callback=log_callback, level=log_level)
-        ui_handler.setFormatter(log_config.formatter)
-        self.logger.addHandler(ui_handler)
-
-        file_handler = FileLogHandler(str(gui_log_path), mode="a", encoding="utf-8")
-        file_handler.setLevel(log_level)
-        file_handler.setFormatter(log_config.formatter)
-        self.logger.addHandler(file_handler)
-
     def _apply_dark_theme(self):
-        colors = {
-            "bg": "#1a1a1a", "bg_card": "#252526", "fg": "#ffffff",
-            "accent": "#007acc", "accent_hover": "#005a9e", "border": "#3c3c3c",
-            "scroll": "#2d2d2d", "log_bg": "#1e1e1e", "log_text": "#dcdcdc",
-            "folder_btn": "#006699", "folder_btn_hover": "#0088cc"
-        }
-        self._set_theme_style(colors)
+        self._set_theme_style(_DARK_COLORS)
 
     def _apply_light_theme(self):
-        colors = {
-            "bg": "#f0f0f0", "bg_card": "#ffffff", "fg": "#333333",
-            "accent": "#0056b3", "accent_hover": "#003d82", "border": "#cccccc",
-            "scroll": "#e0e0e0", "log_bg": "#f9f9f9", "log_text": "#111111",
-            "folder_btn": "#006699", "folder_btn_hover": "#0088cc"
-        }
-        self._set_theme_style(colors)
+        self._set_theme_style(_LIGHT_COLORS)
 
     def _set_theme_style(self, colors):
-        font_family = "Segoe UI, Arial, sans-serif"
-        font_size = 10
-
-        self.setStyleSheet(f"""
-            QMainWindow {{ background: {colors['bg']}; color: {colors['fg']}; font-family: '{font_family}'; font-size: {font_size}pt; }}
-            QLabel {{ color: {colors['fg']}; font-weight: 500; }}
-            QLineEdit {{ padding: 12px; border: 1px solid {colors['border']}; border-radius: 10px; background: {colors['bg_card']}; }}
-            QLineEdit:focus {{ border: 2px solid {colors['accent']}; }}
-            QGroupBox {{ border: 1px solid {colors['border']}; border-radius: 12px; margin-top: 20px; padding: 15px; background: {colors['bg_card']}; }}
-            QGroupBox::title {{ subcontrol-origin: margin; subcontrol-position: top left; padding: 0 8px; }}
-            QPushButton {{ min-height: 24px; padding: 10px 16px; border-radius: 10px; font-weight: 600; font-size: 11pt; border: none; }}
-            QPushButton#run_button {{ background: {colors['accent']}; color: white; }}
-            QPushButton#run_button:hover {{ background: {colors['accent_hover']}; transform: scale(1.03); transition: all 0.2s ease; }}
-            QPushButton#browse_button {{ background: {colors['folder_btn']}; color: white; }}
-            QPushButton#browse_button:hover {{ background: {colors['folder_btn_hover']}; transform: scale(1.03); transition: all 0.2s ease; }}
-            QPushButton#folder_button {{ background: #555; color: white; }}
-            QPushButton#folder_button:hover {{ background: #777; }}
-            QProgressBar::chunk {{ background: {colors['accent']}; border-radius: 4px; }}
-            QPlainTextEdit {{ background: {colors['log_bg']}; color: {colors['log_text']}; border: 1px solid {colors['border']}; border-radius: 10px; font-family: 'Consolas', monospace; font-size: 9pt; }}
-            QScrollBar:vertical {{ width: 10px; background: {colors['scroll']}; border-radius: 5px; }}
-            QScrollBar::handle:vertical {{ background: {colors['border']}; border-radius: 5px; }}
-            QScrollBar::handle:vertical:hover {{ background: {colors['accent']}; }}
-            QCheckBox {{ color: {colors['fg']}; font-weight: 500; }}
-        """)
-        self.log_text.setStyleSheet(f"background: {colors['log_bg']}; color: {colors['log_text']};")
+        window_style, log_style = _theme_stylesheets(tuple(sorted(colors.items())))
+        self.setStyleSheet(window_style)
+        self.log_text.setStyleSheet(log_style)
 
     def _apply_current_theme(self):
         if self.is_dark_theme:
@@ -266,13 +293,18 @@ class BaseMainWindow(QMainWindow):
     def append_log(self, message: str) -> None:
         if not hasattr(self, 'log_text') or self.log_text is None:
             return
-        text = message.rstrip() + "\n"
-        cursor = self.log_text.textCursor()
-        cursor.movePosition(cursor.MoveOperation.End)
-        self.log_text.setTextCursor(cursor)
-        self.log_text.insertPlainText(text)
-        from PyQt6.QtCore import QTimer
-        QTimer.singleShot(10, lambda: self.log_text.ensureCursorVisible())
+        # appendPlainText добавляет строку в конец без перемещения курсора
+        # и сам прокручивает лог, если он уже был прокручен до конца
+        self.log_text.appendPlainText(message.rstrip())
+
+    def _flush_log(self) -> None:
+        """Выводит в окно лога накопленные сообщения одной вставкой."""
+        queue = self._log_queue
+        count = min(len(queue), self.LOG_FLUSH_BATCH)
+        if not count:
+            return
+        batch = [queue.popleft().rstrip() for _ in range(count)]
+        self.append_log("\n".join(batch))
 
     def browse_directory(self) -> None:
         folder = QFileDialog.getExistingDirectory(self, "Выберите папку с CSV")
@@ -281,21 +313,38 @@ class BaseMainWindow(QMainWindow):
             self.populate_file_list()
 
     def populate_file_list(self) -> None:
-        for checkbox in self.file_checkboxes:
-            checkbox.setParent(None)
+        # Список перестраивается с выключенной перерисовкой: одна раскладка
+        # и одна отрисовка после всех изменений, а не на каждый виджет
+        self.files_widget.setUpdatesEnabled(False)
+        try:
+            self._fill_file_list()
+        finally:
+            self.files_widget.setUpdatesEnabled(True)
+            self.files_widget.updateGeometry()
+
+    def _fill_file_list(self) -> None:
+        while (item := self.files_layout.takeAt(0)) is not None:
+            widget = item.widget()
+            if widget is not None:
+                widget.hide()
+                widget.deleteLater()  # Удаляется Qt, а не сборщиком мусора
         self.file_checkboxes.clear()
 
         folder = self.dir_input.text()
-        if not folder or not Path(folder).is_dir():
+        if not folder:
             return
 
         try:
-            files = [f for f in Path(folder).iterdir() if f.is_file() and f.suffix.lower() == '.csv' and f.name.lower() != 'sample.csv']
-            files = sorted(files, key=lambda x: x.name)
+            # FileManager перебирает папку через os.scandir (без stat на файл)
+            # и сортирует по строке имени; отдельная проверка is_dir() не нужна
+            files = FileManager(folder).get_csv_files(exclude_files=["sample.csv"])
+        except (FileNotFoundError, NotADirectoryError):
+            return
         except Exception as e:
             assert self.logger is not None
-            self.logger.error(f"Ошибка чтения папки: {e}")
+            self.logger.error("Ошибка чтения папки: %s", e)
             return
+        self._current_dir = Path(folder)  # Папка прочитана — значит, существует
 
         if not files:
             no_files_label = QLabel("📁 Нет подходящих CSV-файлов")
@@ -311,7 +360,7 @@ class BaseMainWindow(QMainWindow):
             self.file_checkboxes.append(checkbox)
 
         assert self.logger is not None
-        self.logger.info(f"Найдено файлов: {len(files)}")
+        self.logger.info("Найдено файлов: %s", len(files))
 
     def start_conversion(self) -> None:
         raise NotImplementedError("start_conversion() должен быть реализован в подклассе")
@@ -319,9 +368,13 @@ class BaseMainWindow(QMainWindow):
     def process_file(self, csv_path: Path, parent_uid: str, log_dir_path: Path) -> None:
         raise NotImplementedError("process_file() должен быть реализован в подклассе")
 
+    def _invalidate_current_dir(self) -> None:
+        self._current_dir = None
+
     def open_results_folder(self) -> None:
         folder = self.dir_input.text()
-        if not folder or not Path(folder).is_dir():
+        # Папка, уже прочитанная populate_file_list, повторно не проверяется
+        if not folder or (self._current_dir is None and not Path(folder).is_dir()):
             assert self.logger is not None
             self.logger.info("Папка не выбрана или не найдена.")
             return
@@ -335,12 +388,15 @@ class BaseMainWindow(QMainWindow):
             else:
                 QProcess.startDetached('xdg-open', [folder])
             assert self.logger is not None
-            self.logger.info(f"Открыта папка: {folder}")
+            self.logger.info("Открыта папка: %s", folder)
         except Exception as e:
             assert self.logger is not None
-            self.logger.error(f"Не удалось открыть папку: {e}")
+            self.logger.error("Не удалось открыть папку: %s", e)
 
     def closeEvent(self, event) -> None:
         if self.logger_manager:
             self.logger_manager.cleanup_all_loggers()
+        self._log_flush_timer.stop()
+        while self._log_queue:
+            self._flush_log()
         super().closeEvent(event)
\ No newline at end of file
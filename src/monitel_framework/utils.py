@@ -4,9 +4,11 @@
 
 import sys
 import os
+import time
+from datetime import date, datetime, timedelta
 from pathlib import Path
 import re
-from typing import Optional
+from typing import Optional, Tuple
 
 def resource_path(relative_path: str) -> str:
     """
@@ -68,4 +70,27 @@ def get_file_size(file_path: str) -> Optional[int]:
     path = Path(file_path)
     if path.exists() and path.is_file():
         return path.stat().st_size
-    return None
\ No newline at end of file
+    return None
+
+# Сегодняшняя дата для имён логов: (момент следующей полуночи, "YYYY-MM-DD")
+_TODAY_CACHE: Tuple[float, str] = (0.0, "")
+
+def today_str() -> str:
+    """
+    Возвращает сегодняшнюю дату в формате YYYY-MM-DD (для имён файлов логов).
+
+    Строка пересчитывается только после локальной полуночи; в остальное
+    время — одно сравнение с time.time().
+
+    Returns:
+        str: дата, например "2025-09-05"
+    """
+    global _TODAY_CACHE
+    valid_until, value = _TODAY_CACHE
+    if time.time() < valid_until:
+        return value
+    today = date.today()
+    value = today.isoformat()
+    tomorrow = datetime.combine(today + timedelta(days=1), datetime.min.time())
+    _TODAY_CACHE = (tomorrow.timestamp(), value)
+    return value
@@ -20,7 +20,7 @@ from PyQt6.QtWidgets import QApplication
 
 # Фреймворк
 try:
-    from monitel_framework import BaseMainWindow, ConfigManager
+    from monitel_framework import BaseMainWindow, ConfigManager, today_str
     from monitel_framework.files import FileManager
     from monitel_framework.logging import LoggerManager, LoggerConfig
 except Exception as e:
@@ -41,7 +41,7 @@ def load_main_module():
     except Exception as e:
         print(f"❌ Ошибка загрузки main.py: {e}")
         if 'logger' in globals():
-            logger.error(f"❌ Не удалось загрузить main.py: {e}")
+            logger.error("❌ Не удалось загрузить main.py: %s", e)
         return False
 
 class MainWindow(BaseMainWindow):
@@ -52,9 +52,9 @@ class MainWindow(BaseMainWindow):
 
         # 🔹 Дополнительные отладочные логи
         self.logger.debug("🔧 MainWindow: инициализация завершена")
-        self.logger.debug(f"📁 Рабочая директория: {Path.cwd()}")
-        self.logger.debug(f"📄 config.json путь: {self.config.config_path}")
-        self.logger.debug(f"📂 log_dir_path: {self.log_dir_path}")
+        self.logger.debug("📁 Рабочая директория: %s", Path.cwd())
+        self.logger.debug("📄 config.json путь: %s", self.config.config_path)
+        self.logger.debug("📂 log_dir_path: %s", self.log_dir_path)
 
         if not load_main_module():
             self.logger.critical("🛑 КРИТИЧЕСКАЯ ОШИБКА: main.py не загружен. Приложение НЕ БУДЕТ работать.")
@@ -67,8 +67,8 @@ class MainWindow(BaseMainWindow):
             csv_dir = self.dir_input.text().strip()
 
             self.logger.info("🚀 Запуск обработки...")
-            self.logger.debug(f"UID: '{folder_uid}'")
-            self.logger.debug(f"Папка CSV: '{csv_dir}'")
+            self.logger.debug("UID: '%s'", folder_uid)
+            self.logger.debug("Папка CSV: '%s'", csv_dir)
 
             if not folder_uid:
                 self.logger.error("❌ Не указан UID папки.")
@@ -79,7 +79,7 @@ class MainWindow(BaseMainWindow):
                 return
 
             if not Path(csv_dir).is_dir():
-                self.logger.error(f"❌ Папка не существует: {csv_dir}")
+                self.logger.error("❌ Папка не существует: %s", csv_dir)
                 return
 
             self.status_label.setText("🔄 Обработка...")
@@ -88,20 +88,20 @@ class MainWindow(BaseMainWindow):
 
             file_manager = FileManager(base_directory=csv_dir)
             if not file_manager.validate_directory():
-                self.logger.error(f"❌ Папка не найдена или пуста: {csv_dir}")
+                self.logger.error("❌ Папка не найдена или пуста: %s", csv_dir)
                 return
 
             exclude_files = self.config.get("io.exclude_files", ["Sample.csv"])
-            self.logger.debug(f"📋 Исключённые файлы: {exclude_files}")
+            self.logger.debug("📋 Исключённые файлы: %s", exclude_files)
             csv_files = file_manager.get_csv_files(exclude_files=exclude_files)
 
             if not csv_files:
                 self.logger.error("❌ Нет подходящих CSV-файлов.")
                 return
 
-            self.logger.info(f"📦 Найдено файлов: {len(csv_files)}")
+            self.logger.info("📦 Найдено файлов: %s", len(csv_files))
             for f in csv_files:
-                self.logger.debug(f"📄 Обрабатываемый файл: {f}")
+                self.logger.debug("📄 Обрабатываемый файл: %s", f)
 
             total = len(csv_files)
             self.progress_bar.setMaximum(total)
@@ -112,9 +112,9 @@ class MainWindow(BaseMainWindow):
 
             for i, filename in enumerate(csv_files, 1):
                 csv_path = file_manager.base_directory / filename
-                self.logger.info(f"--- [{i}/{total}] Обработка: {filename} ---")
-                self.logger.debug(f"🔍 Путь к файлу: {csv_path}")
-                self.logger.debug(f"📝 Лог будет сохранён в: {log_dir_path / f'{csv_path.stem}_*.log'}")
+                self.logger.info("--- [%s/%s] Обработка: %s ---", i, total, filename)
+                self.logger.debug("🔍 Путь к файлу: %s", csv_path)
+                self.logger.debug("📝 Лог будет сохранён в: %s", log_dir_path / f'{csv_path.stem}_*.log')
 
                 self.process_file(csv_path, folder_uid, log_dir_path)
                 self.progress_bar.setValue(i)
@@ -126,7 +126,7 @@ class MainWindow(BaseMainWindow):
         except Exception as e:
             import traceback
             tb = ''.join(traceback.format_exception(None, e, e.__traceback__))
-            self.logger.error(f"❌ Ошибка в start_conversion:\n{e}\n{tb}", exc_info=True)
+            self.logger.error("❌ Ошибка в start_conversion:\n%s\n%s", e, tb, exc_info=True)
         finally:
             self.run_btn.setEnabled(True)
 
@@ -136,9 +136,7 @@ class MainWindow(BaseMainWindow):
                 self.logger.error("❌ Функция main_process_file не загружена. Проверьте main.py")
                 return
 
-            from datetime import datetime
-            date_str = datetime.now().strftime("%Y-%m-%d")
-            csv_log_path = log_dir_path / f"{csv_path.stem}_{date_str}.log"
+            csv_log_path = log_dir_path / f"{csv_path.stem}_{today_str()}.log"
 
             log_level = getattr(logging, self.config.get("logging.level", "INFO"))
             log_config = LoggerConfig(level=log_level)
@@ -148,14 +146,14 @@ class MainWindow(BaseMainWindow):
             )
             file_logger.setLevel(log_level)
 
-            self.logger.debug(f"🖨 Создан логгер для файла: {csv_log_path}")
+            self.logger.debug("🖨 Создан логгер для файла: %s", csv_log_path)
 
             main_process_file(csv_path, parent_uid, self.config, logger=file_logger)
 
         except Exception as e:
             import traceback
             tb = ''.join(traceback.format_exception(None, e, e.__traceback__))
-            self.logger.error(f"❌ Ошибка в process_file:\n{e}\n{tb}", exc_info=True)
+            self.logger.error("❌ Ошибка в process_file:\n%s\n%s", e, tb, exc_info=True)
 
 
 def main():
@@ -4,6 +4,10 @@
 import tempfile
 import os
 import json
+import pickle
+import pytest
+from unittest.mock import patch
+from src.monitel_framework import config as config_module
 from src.monitel_framework.config import ConfigManager
 
 
@@ -30,4 +34,95 @@ def test_get_with_default():
         with open(config_path, "w") as f:
             json.dump({}, f)
         config = ConfigManager(config_path)
-        assert config.get("unknown.key", "default") == "default"
\ No newline at end of file
+        assert config.get("unknown.key", "default") == "default"
+
+
+def test_default_config_roundtrip():
+    """Проверка сохранения и чтения дефолтного конфига с orjson и без него"""
+    for backend in (config_module.orjson, None):
+        with tempfile.TemporaryDirectory() as tmpdir, patch.object(config_module, "orjson", backend):
+            config_path = os.path.join(tmpdir, "config.json")
+            created = ConfigManager(config_path)
+            assert os.path.exists(config_path)
+            reloaded = ConfigManager(config_path)
+            assert reloaded.config == created.config
+            assert reloaded.get("csv.headers.path") == "НаименованиеКонтейнераОборудования"
+
+
+def test_config_cache():
+    """Проверка кэша: файл не перечитывается без изменения mtime, экземпляры независимы"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = os.path.join(tmpdir, "config.json")
+        with open(config_path, "w", encoding="utf-8") as f:
+            json.dump({"io": {"log_dir": "log"}}, f)
+        first = ConfigManager(config_path)
+        mtime_ns = os.stat(config_path).st_mtime_ns
+
+        # Другое содержимое при том же mtime — берётся закэшированный конфиг
+        with open(config_path, "w", encoding="utf-8") as f:
+            json.dump({"io": {"log_dir": "other"}}, f)
+        os.utime(config_path, ns=(mtime_ns, mtime_ns))
+        first._config["io"]["log_dir"] = "changed"
+        second = ConfigManager(config_path)
+        assert second.get("io.log_dir") == "log"
+
+        second.reload()
+        assert second.get("io.log_dir") == "other"
+
+
+def test_set_saves_on_flush():
+    """Проверка отложенного сохранения: изменения set() попадают в файл при flush()"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = os.path.join(tmpdir, "config.json")
+        with open(config_path, "w", encoding="utf-8") as f:
+            json.dump({"io": {"log_dir": "log"}}, f)
+        config = ConfigManager(config_path)
+        config.set("io.log_dir", "first")
+        config.set("io.log_dir", "second")
+        assert config.get("io.log_dir") == "second"
+
+        config.flush()
+        with open(config_path, encoding="utf-8") as f:
+            assert json.load(f)["io"]["log_dir"] == "second"
+        config.reload()
+        assert config.get("io.log_dir") == "second"
+
+
+def test_config_pickle():
+    """Проверка pickle: без записи в файл, несохранённые изменения переходят в копию"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = os.path.join(tmpdir, "config.json")
+        with open(config_path, "w", encoding="utf-8") as f:
+            json.dump({"io": {"log_dir": "log"}}, f)
+        config = ConfigManager(config_path)
+        config.set("io.log_dir", "pickled")
+
+        copy = pickle.loads(pickle.dumps(config))
+        assert copy.get("io.log_dir") == "pickled"
+        with open(config_path, encoding="utf-8") as f:
+            assert json.load(f)["io"]["log_dir"] == "log"
+
+        copy.flush()
+        with open(config_path, encoding="utf-8") as f:
+            assert json.load(f)["io"]["log_dir"] == "pickled"
+        config.flush()
+
+        copy.set("io.log_dir", "copy")
+        copy.flush()
+        assert ConfigManager(config_path).get("io.log_dir") == "copy"
+
+
+def test_timer_save_error_raised_on_flush():
+    """Проверка: ошибка отложенного сохранения выбрасывается следующим flush()"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = os.path.join(tmpdir, "config.json")
+        config = ConfigManager(config_path)
+        config.set("io.log_dir", "pending")
+
+        with patch.object(config, "_save_config", side_effect=OSError("disk full")):
+            config._flush_from_timer()  # Как при срабатывании таймера
+
+        with pytest.raises(OSError):
+            config.flush()
+        config.flush()  # Изменения не потеряны — повторная попытка сохраняет
+        assert ConfigManager(config_path).get("io.log_dir") == "pending"
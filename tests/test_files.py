@@ -4,6 +4,8 @@
 import unittest
 import tempfile
 import os
+import sys
+from unittest.mock import patch
 from datetime import datetime
 from src.monitel_framework.files import FileManager, CLIManager
 from pathlib import Path
@@ -58,6 +60,29 @@ class TestFileManager(unittest.TestCase):
         self.assertEqual(len(files), 1)
         self.assertEqual(files[0], "data.csv")
 
+    def test_get_csv_files_filters_and_sorts(self):
+        """Проверка фильтра по расширению без учёта регистра, исключений по умолчанию и сортировки"""
+        for name in ("b.csv", "a.CSV", "Sample.csv", "notes.txt"):
+            open(os.path.join(self.temp_dir.name, name), "w").close()
+
+        self.assertEqual([p.name for p in self.file_manager.get_csv_files()], ["a.CSV", "b.csv"])
+        unsorted = self.file_manager.get_csv_files(sort=False)
+        self.assertEqual(sorted(p.name for p in unsorted), ["a.CSV", "b.csv"])
+
+    def test_validate_and_list_files_streams_iter_csv_files(self):
+        """Проверка вывода файлов по мере перебора iter_csv_files"""
+        for name in ("b.csv", "a.csv", "notes.txt"):
+            open(os.path.join(self.temp_dir.name, name), "w").close()
+
+        self.assertEqual(sorted(p.name for p in self.file_manager.iter_csv_files()), ["a.csv", "b.csv"])
+        with patch("builtins.print") as mock_print:
+            files = CLIManager.validate_and_list_files(self.file_manager)
+        self.assertEqual(sorted(p.name for p in files), ["a.csv", "b.csv"])
+        printed = [call.args[0] for call in mock_print.call_args_list]
+        self.assertEqual(printed[0], "Будут обработаны файлы:")
+        self.assertEqual(printed[1:3], [f"   {f}" for f in files])
+        self.assertEqual(printed[-1], "-" * 25)
+
 
 class TestCLIManager(unittest.TestCase):
     def test_cli_manager_creation(self):
@@ -65,6 +90,15 @@ class TestCLIManager(unittest.TestCase):
         cli = CLIManager()
         self.assertIsNotNone(cli)
 
+    def test_jobs_flag(self):
+        """Проверка разбора --jobs и его исключения из позиционных аргументов"""
+        with patch.object(sys, "argv", ["main.py", "--jobs", "4", "uid", "dir"]):
+            self.assertEqual(CLIManager.get_jobs(), 4)
+            self.assertEqual(CLIManager._positional_args(), ["uid", "dir"])
+        with patch.object(sys, "argv", ["main.py", "uid", "dir", "--jobs=x"]):
+            self.assertIsNone(CLIManager.get_jobs())
+            self.assertEqual(CLIManager._positional_args(), ["uid", "dir"])
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
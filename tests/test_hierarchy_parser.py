@@ -0,0 +1,83 @@
+"""
+Тесты для HierarchyParser
+"""
+import unittest
+import tempfile
+import os
+from src.modules.hierarchy_parser import HierarchyParser
+
+
+HEADER = "НаименованиеКонтейнераОборудования;uid;ОбъектРемонтаКодККС\n"
+
+
+class TestHierarchyParser(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_csv(self, content: str, encoding: str = "utf-8-sig") -> str:
+        path = os.path.join(self.temp_dir.name, "data.csv")
+        with open(path, "w", encoding=encoding, newline="") as f:
+            f.write(content)
+        return path
+
+    def test_read_lines_returns_normalized_paths(self):
+        """Проверка, что _read_lines возвращает уже нормализованные кортежи"""
+        path = self.write_csv(HEADER + " A \\ B \\ B \\C;;K1\n\\\\;;\n")
+        lines = HierarchyParser(path)._read_lines()
+        self.assertEqual(lines, [(("A", "B", "C"), "", "K1")])
+
+    def test_read_lines_shares_repeated_segments(self):
+        """Проверка, что одинаковые сегменты разных строк — один объект"""
+        path = self.write_csv(HEADER + "Корпус 1\\Щит;;\nКорпус 1\\Шкаф;;\n")
+        (first, _, _), (second, _, _) = HierarchyParser(path)._read_lines()
+        self.assertIs(first[0], second[0])
+
+    def test_parse_adds_ancestors(self):
+        """Проверка восстановления предков и карты ККС"""
+        path = self.write_csv(HEADER + "A\\B\\C;;K1\n")
+        paths, external_children, cck_map, parent_uid_map = HierarchyParser(path).parse()
+        self.assertEqual(paths, [("A",), ("A", "B"), ("A", "B", "C")])
+        self.assertEqual(external_children, {})
+        self.assertEqual(cck_map, {("A", "B", "C"): "K1"})
+        self.assertEqual(parent_uid_map, {})
+
+    def test_parse_orders_paths_by_depth(self):
+        """Проверка, что пути упорядочены по глубине, а внутри уровня — по имени"""
+        path = self.write_csv(HEADER + "B\\C;;\nA\\D\\E;;\n")
+        paths, _, _, _ = HierarchyParser(path).parse()
+        self.assertEqual(paths, [
+            ("A",), ("B",),
+            ("A", "D"), ("B", "C"),
+            ("A", "D", "E"),
+        ])
+
+    def test_parse_virtual_container(self):
+        """Проверка, что строка с uid становится виртуальным контейнером"""
+        path = self.write_csv(HEADER + "A\\B;uid-1;\nA\\B\\C;;\nA\\B\\C\\D;;\n")
+        parser = HierarchyParser(path)
+        paths, external_children, _, parent_uid_map = parser.parse()
+        self.assertNotIn(("A", "B"), paths)
+        self.assertEqual(external_children, {("A",): ["uid-1"]})
+        self.assertEqual(parent_uid_map, {("A", "B", "C"): "uid-1"})
+        self.assertEqual(parser.path_to_uid, {("A", "B"): "uid-1"})
+
+    def test_read_cp1251(self):
+        """Проверка чтения файла в cp1251"""
+        path = self.write_csv(HEADER + "Корпус\\Щит;;\n", encoding="cp1251")
+        parser = HierarchyParser(path)
+        self.assertEqual(parser._detect_encoding(), "cp1251")
+        self.assertEqual(parser._read_lines(), [(("Корпус", "Щит"), "", "")])
+
+    def test_read_utf16(self):
+        """Проверка чтения файла в UTF-16 с BOM"""
+        path = self.write_csv(HEADER.replace(";", "\t") + "A\\B\tuid-1\t\n", encoding="utf-16")
+        parser = HierarchyParser(path)
+        self.assertEqual(parser._detect_encoding(), "utf-16")
+        self.assertEqual(parser._read_lines(), [(("A", "B"), "uid-1", "")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -77,6 +77,14 @@ class TestFileLogHandler(unittest.TestCase):
             content = f.read()
             self.assertIn("File log test", content)
 
+    def test_file_handler_without_records_creates_nothing(self):
+        """Проверка, что без записей FileLogHandler не создаёт файл"""
+        log_path = os.path.join(self.temp_dir.name, "empty", "test.log")
+        handler = FileLogHandler(log_path)
+        handler.close()
+
+        self.assertFalse(os.path.exists(log_path))
+
 
 class TestLoggerManager(unittest.TestCase):
     def setUp(self):
@@ -110,6 +118,36 @@ class TestLoggerManager(unittest.TestCase):
         with open(log_path, "r", encoding="utf-8") as f:
             self.assertIn("Test log entry", f.read())
 
+    def test_create_logger_reuses_same_parameters(self):
+        """Проверка, что повторный запрос с теми же параметрами не пересоздаёт обработчики"""
+        manager = LoggerManager(self.config)
+        log_path = os.path.join(self.temp_dir.name, "test.log")
+
+        logger = manager.create_logger("reuse", log_file_path=log_path)
+        handlers = list(logger.handlers)
+        self.assertIs(manager.create_logger("reuse", log_file_path=log_path), logger)
+        self.assertEqual(logger.handlers, handlers)
+
+        other_path = os.path.join(self.temp_dir.name, "other.log")
+        manager.create_logger("reuse", log_file_path=other_path)
+        self.assertNotEqual(logger.handlers, handlers)
+        manager.cleanup_all_loggers()
+
+    def test_ui_callback_receives_queued_messages(self):
+        """Проверка доставки сообщений в UI через очередь и фоновый поток"""
+        manager = LoggerManager(LoggerConfig(level=logging.INFO))
+        messages = []
+
+        logger = manager.create_logger("queued", ui_callback=messages.append)
+        logger.info("Сообщение %s", 1)
+        logger.debug("Ниже уровня")
+
+        # Остановка слушателя дописывает накопленные записи
+        manager.cleanup_all_loggers()
+        self.assertEqual(len(messages), 1)
+        self.assertIn("Сообщение 1", messages[0])
+        self.assertIn("INFO", messages[0])
+
     def test_cleanup_all_loggers(self):
         """Проверка очистки логгеров"""
         manager = LoggerManager(self.config)
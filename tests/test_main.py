@@ -0,0 +1,43 @@
+"""
+Тесты для CLI-обработки (src/main.py)
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+MAIN_SCRIPT = ROOT_DIR / "src" / "main.py"
+SAMPLE_CSV = ROOT_DIR / "examples" / "Sample.csv"
+
+
+class TestMainParallel(unittest.TestCase):
+    def test_process_pool_with_two_files(self):
+        """Проверка пакетной обработки двух файлов в пуле процессов (--jobs 2)"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name in ("a.csv", "b.csv"):
+                shutil.copy(SAMPLE_CSV, os.path.join(tmpdir, name))
+
+            result = subprocess.run(
+                [sys.executable, str(MAIN_SCRIPT), "root-uid", tmpdir, "--jobs", "2"],
+                cwd=tmpdir,
+                capture_output=True,
+                text=True,
+                encoding="utf-8",
+                # Вывод с эмодзи через канал: на Windows иначе кодировка консоли
+                env={**os.environ, "PYTHONIOENCODING": "utf-8"},
+                timeout=120
+            )
+
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertIn("✅ Обработан: a.csv", result.stdout)
+            self.assertIn("✅ Обработан: b.csv", result.stdout)
+            for name in ("a.xml", "b.xml"):
+                self.assertTrue(os.path.exists(os.path.join(tmpdir, name)), name)
+
+
+if __name__ == "__main__":
+    unittest.main()
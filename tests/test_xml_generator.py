@@ -0,0 +1,67 @@
+"""
+Тесты для XMLGenerator
+"""
+import unittest
+import uuid
+import xml.etree.ElementTree as ET
+from src.modules.xml_generator import XMLGenerator
+
+
+CIM = "{http://iec.ch/TC57/2014/CIM-schema-cim16#}"
+ME = "{http://monitel.com/2014/schema-cim16#}"
+
+
+class TestXMLGenerator(unittest.TestCase):
+    def generate(self, paths, cck_map=None):
+        return XMLGenerator().generate(
+            paths=paths,
+            external_children={},
+            parent_uid="#_root",
+            cck_map=cck_map or {},
+            parent_uid_map={}
+        )
+
+    def test_empty_paths_raise(self):
+        """Проверка, что пустой список путей вызывает ValueError"""
+        with self.assertRaises(ValueError):
+            self.generate([])
+
+    def test_generate_hierarchy(self):
+        """Проверка типов элементов и ссылок на родителя"""
+        root = ET.fromstring(self.generate([("A",), ("A", "B")]))
+        container = root.find(f"{CIM}AssetContainer")
+        leaf = root.find(f"{ME}GenericPSR")
+        assert container is not None and leaf is not None
+        self.assertEqual(container.findtext(f"{CIM}IdentifiedObject.name"), "A")
+        self.assertEqual(leaf.findtext(f"{CIM}IdentifiedObject.name"), "B")
+        parent = leaf.find(f"{ME}IdentifiedObject.ParentObject")
+        assert parent is not None
+        self.assertEqual(
+            parent.get("{http://www.w3.org/1999/02/22-rdf-syntax-ns#}resource"),
+            container.get("{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about")
+        )
+
+    def test_generate_ids_are_uuid4(self):
+        """Проверка, что пакетно сгенерированные ID — уникальные UUID4"""
+        nodes = [("A",), ("A", "B"), ("C",)]
+        id_map = XMLGenerator()._generate_ids(nodes)
+        self.assertEqual(list(id_map), nodes)
+        self.assertEqual(len(set(id_map.values())), len(nodes))
+        for value in id_map.values():
+            self.assertTrue(value.startswith("#_"))
+            parsed = uuid.UUID(value[2:])
+            self.assertEqual(parsed.version, 4)
+            self.assertEqual(parsed.variant, uuid.RFC_4122)
+
+    def test_special_characters_escaped(self):
+        """Проверка экранирования &, <, > в именах и ККС"""
+        xml = self.generate([("Щит <1> & 2",)], cck_map={("Щит <1> & 2",): 'K"&"'})
+        root = ET.fromstring(xml)
+        container = root.find(f"{CIM}AssetContainer")
+        assert container is not None
+        self.assertEqual(container.findtext(f"{CIM}IdentifiedObject.name"), "Щит <1> & 2")
+        self.assertEqual(container.findtext(f"{ME}IdentifiedObject.mRIDStr"), 'K"&"')
+
+
+if __name__ == "__main__":
+    unittest.main()